@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from engines.ConversionEngine import ConversionEngine
+from engines.DownloadEngine import DownloadEngine
+from managers.JournalManager import JournalManager
+from managers.LanguageManager import LanguageManager
+from managers.PresetManager import PresetManager
+from managers.SettingsManager import SettingsManager
+
+class ConsoleReporter:
+	"""
+		Prints the progress of the engines to standard output, one line per update.
+		Lines are plain text by default, or JSON objects with the source, status, percent and message fields.
+	"""
+
+	def __init__(self, json_output):
+		self.json_output = json_output
+		self.lock = threading.Lock()
+
+	def report(self, source, message, percent, status):
+		if self.json_output:
+			line = json.dumps({"source": source, "status": status, "percent": percent, "message": message}, ensure_ascii=False)
+		else:
+			line = f"[{status}] {percent}% {message}"
+
+		with self.lock:
+			print(line, flush=True)
+
+	def progress_callback(self, source):
+		""" Returns a progress callback for an engine, reporting its updates under the given source. """
+		return lambda message, percent, status: self.report(source, message, percent, status)
+
+	def completion_callback(self, source):
+		""" Returns a completion callback for an engine, reporting its final message under the given source. """
+		return lambda message: self.report(source, message, 100, "completed")
+
+
+class HeadlessRunner:
+	"""
+		Runs downloads and conversions without Qt, using the same settings, presets, languages and job journal as the GUI.
+		Several URLs are downloaded at a time, up to the "maxConcurrentDownloads" setting.
+	"""
+
+	def __init__(self, reporter):
+		self.reporter = reporter
+		self.settings = SettingsManager().settings
+		self.language = LanguageManager().load_language(self.settings["language"])
+
+		preset_manager = PresetManager()
+		self.download_preset = preset_manager.download_preset
+		self.conversion_preset = preset_manager.conversion_preset
+
+		self.journal_manager = JournalManager() if self.settings.get("jobJournal", True) else None
+
+	def get_preset_name(self, presets, name, setting_name, index_setting):
+		"""
+			Returns the preset to use: the given name, otherwise the default preset from the settings.
+			Raises a KeyError if the preset does not exist.
+		"""
+		if name is None:
+			name = self.settings.get(setting_name)
+			if name not in presets:
+				names = list(presets)
+				name = names[min(int(self.settings.get(index_setting, 0)), len(names) - 1)]
+
+		if name not in presets:
+			raise KeyError(f"Preset '{name}' does not exist.")
+		return name
+
+	def get_download_preset_name(self, name=None):
+		return self.get_preset_name(self.download_preset, name, "downloadPreset", "selectedDownloadPreset")
+
+	def get_conversion_preset_name(self, name=None):
+		return self.get_preset_name(self.conversion_preset, name, "conversionPreset", "selectedConversionPreset")
+
+	def download_urls(self, urls, destination, playlist, selected_preset, conversion_preset=None, keep_downloads=False):
+		""" Downloads every URL, several at a time, and returns True if all of them succeeded. """
+		jobs = []
+		for url in urls:
+			job_id = None
+			if self.journal_manager:
+				job_id = self.journal_manager.add_job("download", url, {
+					"destination": destination,
+					"playlist": playlist,
+					"conversion": conversion_preset is not None,
+					"selectedPreset": selected_preset,
+					"conversionPreset": conversion_preset,
+					"keepDownloads": keep_downloads
+				})
+			jobs.append((url, job_id))
+
+		return self.run_downloads(jobs, destination, playlist, selected_preset, conversion_preset, keep_downloads)
+
+	def run_downloads(self, jobs, destination, playlist, selected_preset, conversion_preset, keep_downloads):
+		max_workers = max(1, int(self.settings.get("maxConcurrentDownloads", 3)))
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			results = list(executor.map(
+				lambda job: self.download(job[0], destination, playlist, selected_preset, conversion_preset, keep_downloads, job[1]),
+				jobs
+			))
+		return all(results)
+
+	def download(self, url, destination, playlist, selected_preset, conversion_preset=None, keep_downloads=False, job_id=None):
+		"""
+			Downloads a single URL and, when a conversion preset is given, converts the downloaded files.
+			Only the audio stream is downloaded when the conversion preset is an audio preset. With the "directTranscode"
+			setting, the streams of a video that is not kept are downloaded apart and merged by the conversion itself.
+			With the "streamingConversion" setting, each file is converted as soon as it is downloaded.
+			Returns True if the download and the conversion succeeded.
+		"""
+		conversion = conversion_preset is not None
+		conversion_engine = None
+		conversion_thread = None
+		downloaded_files = []
+
+		if conversion and self.settings.get("streamingConversion", True):
+			conversion_engine = self.create_conversion_engine(url, [], destination, conversion_preset, not keep_downloads, streaming=True)
+			conversion_thread = threading.Thread(target=conversion_engine.run)
+			conversion_thread.start()
+
+		download_engine = DownloadEngine(
+			url,
+			destination,
+			playlist,
+			conversion,
+			selected_preset,
+			self.download_preset,
+			self.language,
+			self.settings,
+			job_id,
+			audio_only=conversion and self.conversion_preset[conversion_preset].get("presetType") == "audio",
+			split_streams=conversion and not keep_downloads and self.settings.get("directTranscode", True),
+			progress_callback=self.reporter.progress_callback(url),
+			conversion_callback=downloaded_files.extend,
+			file_ready_callback=conversion_engine.add_file if conversion_engine else None,
+			completion_callback=self.reporter.completion_callback(url)
+		)
+		download_engine.run()
+
+		if conversion_engine:
+			conversion_engine.close_input()
+			conversion_thread.join()
+		elif downloaded_files:
+			conversion_engine = self.create_conversion_engine(url, downloaded_files, destination, conversion_preset, not keep_downloads)
+			conversion_engine.run()
+
+		return not download_engine.failed and not (conversion_engine and conversion_engine.failed)
+
+	def create_conversion_engine(self, source, media_files, destination, selected_preset, delete_file, streaming=False, job_id=None):
+		return ConversionEngine(
+			media_files,
+			destination,
+			selected_preset,
+			self.conversion_preset,
+			self.language,
+			self.settings,
+			delete_file,
+			streaming,
+			job_id,
+			progress_callback=self.reporter.progress_callback(source),
+			completion_callback=self.reporter.completion_callback(source)
+		)
+
+	def get_conversion_preset_names(self, names=None):
+		"""
+			Returns the conversion presets of a batch: the default preset when no name is given, the preset itself for
+			a single name, or a list of presets, converted from a single decode of every file, for several names.
+		"""
+		if not names:
+			return self.get_conversion_preset_name()
+		names = ConversionEngine.get_preset_names(names)
+		selected_presets = [self.get_conversion_preset_name(name) for name in names]
+		return selected_presets if len(selected_presets) > 1 else selected_presets[0]
+
+	def convert_files(self, media_files, destination, selected_preset, delete_file, job_id=None):
+		""" Converts the media files with the selected preset, or list of presets, and returns True if every file succeeded. """
+		conversion_engine = self.create_conversion_engine(destination, list(media_files), destination, selected_preset, delete_file, job_id=job_id)
+		conversion_engine.run()
+		return not conversion_engine.failed
+
+	def resume(self):
+		"""
+			Runs the download and conversion jobs the journal records as unfinished, with their original options.
+			Resumed downloads are converted with the conversion preset they were queued with, or the default conversion
+			preset when that preset was not recorded or no longer exists.
+			Returns True if every resumed job succeeded.
+		"""
+		if not self.journal_manager:
+			return True
+
+		succeeded = True
+		for job in self.journal_manager.get_unfinished_jobs("download"):
+			options = job["options"]
+			conversion_preset = None
+			if options["conversion"]:
+				conversion_preset = options.get("conversionPreset")
+				if conversion_preset not in self.conversion_preset:
+					conversion_preset = self.get_conversion_preset_name()
+			succeeded &= self.run_downloads([(job["source"], job["id"])], options["destination"], options["playlist"], options["selectedPreset"],
+				conversion_preset, options.get("keepDownloads", False))
+
+		for job in self.journal_manager.get_unfinished_jobs("conversion"):
+			options = job["options"]
+			media_files = [ConversionEngine.parse_input_key(key) for key in self.journal_manager.get_unfinished_items(job["id"])]
+			media_files = [media_input for media_input in media_files if ConversionEngine.input_exists(media_input)]
+			selected_presets = ConversionEngine.get_preset_names(options["selectedPreset"])
+			if not media_files or any(preset_name not in self.conversion_preset for preset_name in selected_presets):
+				self.journal_manager.set_job_state(job["id"], "failed")
+				continue
+			succeeded &= self.convert_files(media_files, options["destination"], options["selectedPreset"], options["deleteFile"], job["id"])
+
+		return succeeded
+
+	def serve(self, stream):
+		"""
+			Daemon mode: resumes unfinished jobs, then runs one job per line read from the stream until it is closed.
+			A line is either a URL, downloaded with the default options, or a JSON object such as
+			{"url": "...", "playlist": true, "preset": "...", "convert": "...", "destination": "..."} or
+			{"files": ["..."], "preset": "...", "destination": "...", "deleteOriginal": false},
+			where the "preset" of a conversion may also be a list of presets.
+			Downloads run several at a time; returns True if every job succeeded.
+		"""
+		succeeded = self.resume()
+		max_workers = max(1, int(self.settings.get("maxConcurrentDownloads", 3)))
+		futures = []
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			for line in stream:
+				line = line.strip()
+				if not line:
+					continue
+
+				try:
+					request = json.loads(line) if line.startswith("{") else {"url": line}
+					futures.append(executor.submit(self.run_request, request))
+				except ValueError as e:
+					self.reporter.report(line, f"{self.language['downloadTab'].get('errorMessage')}: {e}", 0, "error")
+					succeeded = False
+
+		for future in futures:
+			try:
+				succeeded &= future.result()
+			except Exception as e:
+				self.reporter.report("daemon", f"{self.language['downloadTab'].get('errorMessage')}: {e}", 0, "error")
+				succeeded = False
+		return succeeded
+
+	def run_request(self, request):
+		""" Runs a single daemon request and returns True if it succeeded. """
+		if "files" in request:
+			return self.convert_files(
+				request["files"],
+				request.get("destination") or self.settings["defaultConversionFolder"],
+				self.get_conversion_preset_names(request.get("preset")),
+				request.get("deleteOriginal", self.settings["deleteOriginalFile"])
+			)
+
+		conversion_preset = request.get("convert")
+		return self.download_urls(
+			[request["url"]],
+			request.get("destination") or self.settings["defaultDownloadFolder"],
+			request.get("playlist", False),
+			self.get_download_preset_name(request.get("preset")),
+			self.get_conversion_preset_name(conversion_preset) if conversion_preset else None,
+			request.get("keepDownloads", False)
+		)
+
+
+def build_parser():
+	parser = argparse.ArgumentParser(prog="ezdc", description="Download and convert media files without the graphical interface.")
+	parser.add_argument("--json", action="store_true", help="print progress as JSON lines instead of plain text")
+	subparsers = parser.add_subparsers(dest="command", required=True)
+
+	download_parser = subparsers.add_parser("download", help="download one or more URLs")
+	download_parser.add_argument("urls", nargs="+", metavar="URL")
+	download_parser.add_argument("-d", "--destination", help="download folder, defaults to the one in the settings")
+	download_parser.add_argument("-p", "--preset", help="download preset, defaults to the one in the settings")
+	download_parser.add_argument("--playlist", action="store_true", help="download the whole playlist")
+	download_parser.add_argument("-c", "--convert", metavar="PRESET", help="convert the downloaded files with this conversion preset")
+	download_parser.add_argument("--keep-downloads", action="store_true", help="keep the downloaded files after converting them")
+
+	convert_parser = subparsers.add_parser("convert", help="convert one or more media files")
+	convert_parser.add_argument("files", nargs="+", metavar="FILE")
+	convert_parser.add_argument("-d", "--destination", help="conversion folder, defaults to the one in the settings")
+	convert_parser.add_argument("-p", "--preset", action="append", help="conversion preset, defaults to the one in the settings; repeat it to convert every file to several presets at once")
+	convert_parser.add_argument("--delete-original", action="store_true", default=None, help="delete the original files after converting them")
+
+	subparsers.add_parser("presets", help="list the download and conversion presets")
+	subparsers.add_parser("resume", help="run the jobs left unfinished by a previous session")
+	subparsers.add_parser("daemon", help="resume unfinished jobs, then run one job per line read from standard input")
+	return parser
+
+
+def main(argv=None):
+	args = build_parser().parse_args(argv)
+	runner = HeadlessRunner(ConsoleReporter(args.json))
+
+	try:
+		if args.command == "presets":
+			if args.json:
+				print(json.dumps({"download": list(runner.download_preset), "conversion": list(runner.conversion_preset)}, ensure_ascii=False))
+			else:
+				print("Download presets:\n  " + "\n  ".join(runner.download_preset))
+				print("Conversion presets:\n  " + "\n  ".join(runner.conversion_preset))
+			succeeded = True
+		elif args.command == "download":
+			succeeded = runner.download_urls(
+				args.urls,
+				args.destination or runner.settings["defaultDownloadFolder"],
+				args.playlist,
+				runner.get_download_preset_name(args.preset),
+				runner.get_conversion_preset_name(args.convert) if args.convert else None,
+				args.keep_downloads
+			)
+		elif args.command == "convert":
+			delete_file = runner.settings["deleteOriginalFile"] if args.delete_original is None else args.delete_original
+			succeeded = runner.convert_files(
+				args.files,
+				args.destination or runner.settings["defaultConversionFolder"],
+				runner.get_conversion_preset_names(args.preset),
+				delete_file
+			)
+		elif args.command == "resume":
+			succeeded = runner.resume()
+		else:
+			succeeded = runner.serve(sys.stdin)
+	except KeyError as e:
+		print(e.args[0], file=sys.stderr)
+		return 2
+
+	return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,137 @@
+import threading
+import time
+from datetime import datetime
+
+class BandwidthScheduler:
+	"""
+		Process-wide bandwidth scheduler shared by every active download.
+		All downloads draw from a single token bucket refilled at the total limit of the settings: "bandwidthLimit",
+		or "offPeakBandwidthLimit" between "offPeakStart" and "offPeakEnd". Limits are in KB/s and 0 means unlimited.
+		The limit is divided between the active jobs by weight. The share of a job is split evenly between its attached
+		downloads, such as the parallel entries of a playlist, and applied as their yt-dlp rate limit, so no job starves
+		the others, while the shared bucket keeps the total under the cap.
+		The settings dict is read live, so a new limit or off-peak window applies to the downloads already running.
+	"""
+	# Seconds of traffic the bucket may hold, allowing short bursts after an idle moment.
+	BURST = 1.0
+	# How often the limit is read from the settings and the off-peak window is checked, in seconds.
+	REFRESH_INTERVAL = 1.0
+
+	# Shared by every instance, so every download thread of the process draws from the same bucket.
+	jobs = {}
+	lock = threading.Lock()
+	next_job_id = 1
+	limit = 0
+	tokens = 0.0
+	updated = 0.0
+	refreshed = 0.0
+
+	def __init__(self, settings):
+		self.settings = settings
+
+	def register(self, weight=1):
+		""" Adds an active job with the given weight and returns its id. """
+		with self.lock:
+			job_id = BandwidthScheduler.next_job_id
+			BandwidthScheduler.next_job_id += 1
+			self.jobs[job_id] = {"weight": max(float(weight), 0.1), "params": [], "allocation": 0}
+			self.refresh_limit(time.monotonic(), force=True)
+			return job_id
+
+	def unregister(self, job_id):
+		""" Removes a finished job, giving its share back to the other active jobs. """
+		with self.lock:
+			if self.jobs.pop(job_id, None) is not None:
+				self.rebalance()
+
+	def attach(self, job_id, params):
+		""" Applies a part of the share of the job to the given yt-dlp params dict, and keeps it updated while attached. """
+		with self.lock:
+			job = self.jobs.get(job_id)
+			if job is not None:
+				job["params"].append(params)
+				self.apply_allocation(job)
+
+	def detach(self, job_id, params):
+		with self.lock:
+			job = self.jobs.get(job_id)
+			if job is not None:
+				# Params dicts are compared by identity, as two attached dicts usually hold the same values.
+				job["params"] = [attached for attached in job["params"] if attached is not params]
+				self.apply_allocation(job)
+
+	def get_allocation(self, job_id):
+		""" Returns the current share of the job in bytes per second, or 0 when the bandwidth is unlimited. """
+		with self.lock:
+			job = self.jobs.get(job_id)
+			return job["allocation"] if job is not None else 0
+
+	def consume(self, job_id, byte_count):
+		"""
+			Takes the received bytes from the shared bucket, sleeping in the calling download thread when the bucket
+			is in debt. Every download waits its turn behind the debt, so their total rate stays under the limit.
+		"""
+		if byte_count <= 0:
+			return
+
+		with self.lock:
+			now = time.monotonic()
+			self.refresh_limit(now)
+			limit = self.limit
+			if not limit:
+				return
+
+			elapsed = now - self.updated
+			BandwidthScheduler.tokens = min(limit * self.BURST, self.tokens + elapsed * limit) - byte_count
+			BandwidthScheduler.updated = now
+			delay = -self.tokens / limit if self.tokens < 0 else 0
+
+		if delay > 0:
+			time.sleep(delay)
+
+	def refresh_limit(self, now, force=False):
+		""" Reads the current limit from the settings and divides it again if it changed. Must be called with the lock held. """
+		if not force and now - self.refreshed < self.REFRESH_INTERVAL:
+			return
+
+		BandwidthScheduler.refreshed = now
+		limit_setting = "offPeakBandwidthLimit" if self.is_off_peak() else "bandwidthLimit"
+		limit = max(0, int(self.settings.get(limit_setting, 0) or 0)) * 1024
+		if limit != self.limit or force:
+			if not self.limit:
+				BandwidthScheduler.tokens = limit * self.BURST
+				BandwidthScheduler.updated = now
+			BandwidthScheduler.limit = limit
+			self.rebalance()
+
+	def rebalance(self):
+		""" Divides the limit between the active jobs by weight and updates their rate limits. Must be called with the lock held. """
+		total_weight = sum(job["weight"] for job in self.jobs.values())
+		for job in self.jobs.values():
+			job["allocation"] = int(self.limit * job["weight"] / total_weight) if self.limit else 0
+			self.apply_allocation(job)
+
+	def apply_allocation(self, job):
+		""" Splits the share of a job evenly between its attached params dicts. Must be called with the lock held. """
+		params_count = len(job["params"])
+		for params in job["params"]:
+			params['ratelimit'] = max(1, job["allocation"] // params_count) if job["allocation"] else None
+
+	def is_off_peak(self):
+		""" Returns True when the current time is in the off-peak window, which may span midnight. """
+		start = self.parse_time(self.settings.get("offPeakStart"))
+		end = self.parse_time(self.settings.get("offPeakEnd"))
+		if start is None or end is None or start == end:
+			return False
+
+		now = datetime.now().time()
+		if start < end:
+			return start <= now < end
+		return now >= start or now < end
+
+	@staticmethod
+	def parse_time(value):
+		try:
+			return datetime.strptime(str(value), "%H:%M").time()
+		except ValueError:
+			return None
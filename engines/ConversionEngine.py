@@ -0,0 +1,623 @@
+import json
+import math
+import os
+import re
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from managers.JournalManager import JournalManager
+from managers.ManifestManager import ManifestManager
+from managers.MetadataCacheManager import MetadataCacheManager
+from engines.ConversionPlanner import ConversionPlanner
+from engines.ConversionProgress import ConversionProgress
+from engines.ProgressAggregator import ProgressAggregator
+
+class ConversionEngine:
+	"""
+		Converts media files with FFmpeg using one or several conversion presets, several files at a time.
+		Does not depend on Qt: progress and completion are reported through plain callbacks,
+		so the engine runs the same inside the ConversionThread of the GUI and from the command line.
+		A media input is either a file or a list of files holding the streams of one source, like the separate video
+		and audio streams of a download, which are merged and converted by the same FFmpeg process.
+		Every engine of the process draws its workers from one shared budget, so the streaming conversions of several
+		downloads together run no more FFmpeg processes than a single batch would.
+	"""
+	MIN_SEGMENT_DURATION = 60
+	# How often a conversion waiting for the worker budget checks whether the batch was cancelled, in seconds.
+	CANCEL_INTERVAL = 1.0
+	# Suffix yt-dlp gives the files of streams downloaded separately, such as "video.f137.mp4".
+	STREAM_SUFFIX = re.compile(r"\.f[^.]+$")
+
+	# Shared by every instance: the part of the worker budget used by the conversions running in the process.
+	worker_condition = threading.Condition()
+	worker_load = 0.0
+
+	def __init__(self, media_files, destination, selected_preset, conversion_preset, language, settings, delete_file, streaming=False, job_id=None,
+			progress_callback=None, completion_callback=None):
+		self.media_files = media_files
+		self.destination = destination
+		self.selected_presets = self.get_preset_names(selected_preset)
+		self.selected_preset = self.selected_presets[0]
+		self.conversion_preset = conversion_preset
+		self.language = language
+		self.settings = settings
+		self.delete_file = delete_file
+		self.streaming = streaming
+		self.progress_callback = progress_callback
+		self.completion_callback = completion_callback
+		self.failed = False
+		# Set by `cancel`, which also kills the FFmpeg processes the engine is running.
+		self.cancelled = threading.Event()
+		self.processes = set()
+		self.process_lock = threading.Lock()
+
+		self.progress_lock = threading.Lock()
+		self.file_progress = {self.get_input_files(media_input)[0]: 0 for media_input in media_files}
+		self.input_queue = queue.Queue()
+		self.metadata_manager = MetadataCacheManager()
+		self.manifest_manager = ManifestManager() if settings.get("conversionManifest", True) else None
+		self.progress_aggregator = ProgressAggregator(self.emit_progress)
+
+		self.journal_manager = JournalManager() if settings.get("jobJournal", True) else None
+		self.job_id = job_id
+		if self.journal_manager and job_id is None:
+			self.job_id = self.journal_manager.add_job("conversion", destination, {
+				"destination": destination,
+				"selectedPreset": selected_preset,
+				"deleteFile": delete_file
+			})
+		for media_input in media_files:
+			self.set_item_state(self.get_input_key(media_input), "queued")
+
+	def run(self):
+		"""
+			Converts every queued media file using a pool of concurrent FFmpeg workers.
+			In streaming mode, keeps accepting files from `add_file` until `close_input` is called.
+			Each file reports its own progress while the progress bar shows the batch as a whole.
+			Emits a single completion message once every worker has finished.
+			The job and every file are recorded in the journal, so an interrupted batch resumes with the unfinished files.
+			A cancelled batch returns once its running FFmpeg processes are killed, without a completion message.
+		"""
+		self.set_job_state("running")
+		with ThreadPoolExecutor(max_workers=self.get_worker_count()) as executor:
+			while self.media_files and not self.cancelled.is_set():
+				media_input = self.media_files.pop(0)
+				executor.submit(self.convert_file, media_input)
+
+			while self.streaming and not self.cancelled.is_set():
+				media_input = self.input_queue.get()
+				if media_input is None:
+					break
+				executor.submit(self.convert_file, media_input)
+
+			if self.cancelled.is_set():
+				executor.shutdown(cancel_futures=True)
+
+		self.progress_aggregator.flush()
+		self.metadata_manager.save_cache()
+		if self.cancelled.is_set():
+			self.set_job_state("cancelled")
+			return
+		self.set_job_state("failed" if self.failed else "done")
+
+		all_completed = self.language["conversionTab"].get("allFilesConverted")
+		self.emit_completion(f"{all_completed} {self.destination}")
+
+	def add_file(self, media_input):
+		""" Queues a file, or the list of files of a source, for conversion while the streaming conversion is running. """
+		with self.progress_lock:
+			self.file_progress[self.get_input_files(media_input)[0]] = 0
+		self.set_item_state(self.get_input_key(media_input), "queued")
+		self.input_queue.put(media_input)
+
+	def cancel(self):
+		"""
+			Cancels the batch: files that have not started are dropped, and the running FFmpeg processes, segment
+			encodes included, are killed. `run` returns once the workers have finished, releasing their worker budget.
+		"""
+		self.cancelled.set()
+		self.input_queue.put(None)
+		with self.process_lock:
+			processes = list(self.processes)
+		for process in processes:
+			process.kill()
+
+	def close_input(self):
+		""" Signals that no more files will be added, letting the streaming conversion finish. """
+		self.input_queue.put(None)
+
+	@staticmethod
+	def get_preset_names(selected_preset):
+		""" Returns the selected presets as a list of names, as a batch is given either one preset name or a list of names. """
+		return list(selected_preset) if isinstance(selected_preset, (list, tuple)) else [selected_preset]
+
+	@staticmethod
+	def get_input_files(media_input):
+		""" Returns the files of a media input as a list, the first one naming the source. """
+		return list(media_input) if isinstance(media_input, (list, tuple)) else [media_input]
+
+	@staticmethod
+	def get_input_key(media_input):
+		""" Returns the key a media input is recorded under in the journal: its path, or its list of files as JSON. """
+		input_files = ConversionEngine.get_input_files(media_input)
+		return input_files[0] if len(input_files) == 1 else json.dumps(input_files)
+
+	@staticmethod
+	def parse_input_key(key):
+		""" Returns the media input recorded under a journal key by `get_input_key`. """
+		if key.startswith("["):
+			try:
+				return json.loads(key)
+			except ValueError:
+				pass
+		return key
+
+	@staticmethod
+	def input_exists(media_input):
+		return all(os.path.exists(input_file) for input_file in ConversionEngine.get_input_files(media_input))
+
+	def convert_file(self, media_input):
+		"""
+			Converts a single media input with every selected preset. Runs inside a worker of the pool.
+			The FFmpeg command is planned from the probed source streams, so streams that already match the preset are copied.
+			Jobs already recorded in the conversion manifest are skipped, or linked from an existing output in another folder.
+			When several presets still have to be converted, a single FFmpeg process decodes the input once for all of them.
+			The files of a split source are merged by the same process, without writing the merged file first.
+		"""
+		input_files = self.get_input_files(media_input)
+		input_file = input_files[0]
+		item_key = self.get_input_key(media_input)
+		worker_cost = self.acquire_worker()
+		if worker_cost is None:
+			return
+		try:
+			self.set_item_state(item_key, "running")
+			pending_outputs = []
+			for preset_name in self.selected_presets:
+				preset = self.conversion_preset[preset_name]
+				output_file = self.get_output_file(input_files, preset_name)
+				job_key = self.get_job_key(input_files, preset)
+				existing_outputs = self.manifest_manager.find_outputs(job_key) if job_key else []
+
+				if os.path.abspath(output_file) in existing_outputs:
+					self.report_output(input_file, output_file, self.language["conversionTab"].get("upToDate"))
+				elif existing_outputs:
+					self.manifest_manager.link_output(existing_outputs[0], output_file)
+					self.manifest_manager.record_output(job_key, output_file)
+					self.report_output(input_file, output_file, self.language["conversionTab"].get("reusedOutput"))
+				else:
+					pending_outputs.append((preset, output_file, job_key))
+
+			if len(pending_outputs) == 1:
+				preset, output_file, _ = pending_outputs[0]
+				self.convert(preset, input_files, output_file)
+			elif pending_outputs:
+				self.convert_outputs(input_files, pending_outputs)
+
+			for _, output_file, job_key in pending_outputs:
+				if job_key:
+					self.manifest_manager.record_output(job_key, output_file)
+				self.report_output(input_file, output_file, self.language["conversionTab"].get("completed"))
+
+			if self.delete_file:
+				for source_file in input_files:
+					self.remove_file(source_file)
+			self.set_item_state(item_key, "done")
+
+		except Exception as e:
+			self.failed = True
+			self.set_item_state(item_key, "failed")
+			if self.cancelled.is_set():
+				return
+			error_text = self.language["conversionTab"].get("error")
+			total_percent = self.update_file_progress(input_file, 100)
+			self.progress_aggregator.update(input_file, "error", lambda: (f"{error_text}: {e}", total_percent))
+		finally:
+			self.release_worker(worker_cost)
+
+	def get_worker_cost(self):
+		""" Returns the part of the shared worker budget a conversion of this engine takes: one worker out of `get_worker_count`. """
+		return 1 / self.get_worker_count()
+
+	def acquire_worker(self):
+		"""
+			Waits until the shared worker budget has room for one more conversion of this engine, then takes its part.
+			A conversion always starts when nothing else runs, so an engine is never blocked for good.
+			Returns the part taken, to give back to `release_worker`, as the settings may change while the conversion runs,
+			or None without taking anything once the batch is cancelled.
+		"""
+		cost = self.get_worker_cost()
+		with self.worker_condition:
+			while True:
+				if self.cancelled.is_set():
+					return None
+				if ConversionEngine.worker_load == 0 or ConversionEngine.worker_load + cost <= 1 + 1e-9:
+					break
+				self.worker_condition.wait(self.CANCEL_INTERVAL)
+			ConversionEngine.worker_load += cost
+		return cost
+
+	def acquire_spare_workers(self, cost, count):
+		""" Takes up to `count` more parts of the shared worker budget without waiting, and returns how many were free. """
+		taken = 0
+		with self.worker_condition:
+			while taken < count and ConversionEngine.worker_load + cost <= 1 + 1e-9:
+				ConversionEngine.worker_load += cost
+				taken += 1
+		return taken
+
+	def release_worker(self, cost):
+		with self.worker_condition:
+			ConversionEngine.worker_load = max(0.0, ConversionEngine.worker_load - cost)
+			if ConversionEngine.worker_load < 1e-9:
+				ConversionEngine.worker_load = 0.0
+			self.worker_condition.notify_all()
+
+	def get_job_key(self, input_files, preset):
+		""" Returns the manifest key of the conversion, covering the content of every input file, or None without a manifest. """
+		if not self.manifest_manager:
+			return None
+		job_key = self.manifest_manager.get_job_key(input_files[0], preset)
+		for input_file in input_files[1:]:
+			job_key += ":" + self.manifest_manager.get_input_fingerprint(input_file)
+		return job_key
+
+	def load_input_metadata(self, input_files):
+		"""
+			Returns the metadata of the input files as one source: the streams of every file, each tagged with the
+			"input" it belongs to, and the longest duration. Returns an empty dict if any file cannot be probed.
+		"""
+		if len(input_files) == 1:
+			return self.metadata_manager.load_metadata(input_files[0])
+
+		duration = 0
+		streams = []
+		for input_index, input_file in enumerate(input_files):
+			metadata = self.metadata_manager.load_metadata(input_file)
+			if not metadata:
+				return {}
+			duration = max(duration, metadata.get("duration", 0))
+			streams += [dict(stream, input=input_index) for stream in metadata.get("streams", [])]
+		return {"duration": duration, "streams": streams}
+
+	def report_output(self, input_file, output_file, completed_text):
+		"""
+			Reports that an output of the file is ready. With a single preset the message names the input file,
+			with several presets it names each output file.
+		"""
+		total_percent = self.update_file_progress(input_file, 100)
+		target = input_file if len(self.selected_presets) == 1 else output_file
+		self.progress_aggregator.update(target, "completed", lambda: (f"{completed_text}: {target}", total_percent))
+
+	def prepare_output(self, output_file):
+		# A hardlinked output shares its data with another conversion, so it is unlinked instead of overwritten in place.
+		if os.path.exists(output_file) and os.stat(output_file).st_nlink > 1:
+			os.remove(output_file)
+
+	def convert_outputs(self, input_files, pending_outputs):
+		"""
+			Converts a file to several presets with a single FFmpeg process: the input is decoded once and every decoded
+			stream feeds the filters and encoders of each output. Progress is reported for every output file.
+		"""
+		input_file = input_files[0]
+		metadata = self.load_input_metadata(input_files)
+		outputs = []
+		for preset, output_file, _ in pending_outputs:
+			self.prepare_output(output_file)
+			outputs.append((ConversionPlanner(preset, metadata, len(input_files)), output_file))
+
+		progress = ConversionProgress(metadata.get("duration", 0))
+		output_files = [output_file for _, output_file in outputs]
+		self.run_ffmpeg(
+			ConversionPlanner.build_multi_output_command(input_files, outputs),
+			progress,
+			lambda: self.report_outputs_progress(input_file, output_files, progress)
+		)
+
+	def report_outputs_progress(self, input_file, output_files, progress):
+		"""
+			Reports the progress of every output written by a multi-output conversion.
+			The outputs share one decode, so they advance together; each message adds the current size of its output.
+		"""
+		total_percent = self.update_file_progress(input_file, progress.percent or 0)
+		for output_file in output_files:
+			self.progress_aggregator.update(output_file, "processing", lambda output_file=output_file: self.format_conversion_progress(
+				progress,
+				f"{os.path.basename(output_file)} ({self.get_file_size(output_file) / 1048576:.1f} MB)",
+				total_percent
+			))
+
+	def get_file_size(self, file_path):
+		try:
+			return os.path.getsize(file_path)
+		except OSError:
+			return 0
+
+	def convert(self, preset, input_files, output_file):
+		"""
+			Plans and runs the FFmpeg conversion of a single source, splitting long videos into segments encoded in parallel.
+			A source split over several files is converted in one pass, as segments are cut from a single file.
+		"""
+		input_file = input_files[0]
+		planner = ConversionPlanner(preset, self.load_input_metadata(input_files), len(input_files))
+		if planner.can_remux():
+			remuxing_text = self.language["conversionTab"].get("remuxing")
+			self.progress_aggregator.update(input_file, "remuxing", lambda: (f"{remuxing_text}: {input_file}", self.update_file_progress(input_file, 0)))
+
+		self.prepare_output(output_file)
+
+		if len(input_files) == 1 and self.should_segment(planner, input_file):
+			self.convert_segmented(planner, input_file, output_file)
+		else:
+			self.track_progress(planner.build_command(input_files, output_file), input_file)
+
+	def should_segment(self, planner, input_file):
+		"""
+			Returns True if the file is a long video whose video stream has to be encoded, and there are enough cores
+			to encode several segments at once. Controlled by the "segmentEncoding" and "segmentMinDuration" settings.
+		"""
+		return (
+			self.settings.get("segmentEncoding", True)
+			and self.get_segment_worker_count() > 1
+			and planner.preset.get("presetType") == "video"
+			and planner.get_stream("video") is not None
+			and not planner.can_copy_video()
+			and self.get_duration(input_file) >= int(self.settings.get("segmentMinDuration", 1200))
+		)
+
+	def convert_segmented(self, planner, input_file, output_file):
+		"""
+			Converts a long video by encoding segments of it in parallel:
+			the video stream is split at keyframes with a stream copy, every segment is encoded with the preset while
+			the audio stream is encoded on its own, then the encoded segments and the audio are joined with the concat
+			demuxer, again without re-encoding. The output has the same container, codecs and duration as a normal run.
+			Segments are kept in a temporary folder next to the output, removed once the conversion ends.
+			The file already holds one part of the shared worker budget. Segments use that part plus any spare parts
+			free at the start, never waiting for more, so segment encodes stay within the budget.
+		"""
+		duration = self.get_duration(input_file)
+		segment_time = max(self.MIN_SEGMENT_DURATION, math.ceil(duration / (self.get_segment_worker_count() * 2)))
+		video_stream = planner.get_stream("video")
+		audio_stream = planner.get_stream("audio")
+
+		worker_cost = self.get_worker_cost()
+		spare_workers = self.acquire_spare_workers(worker_cost, self.get_segment_worker_count() - 1)
+		segment_folder = tempfile.mkdtemp(prefix=".segments-", dir=os.path.dirname(os.path.abspath(output_file)))
+		try:
+			self.run_ffmpeg([
+				"ffmpeg", "-y",
+				"-i", input_file,
+				"-map", f"0:{video_stream['index']}",
+				"-c", "copy",
+				"-f", "segment",
+				"-segment_time", str(segment_time),
+				"-segment_format", "matroska",
+				"-reset_timestamps", "1",
+				os.path.join(segment_folder, "source_%05d.mkv")
+			])
+			segments = sorted(name[len("source_"):] for name in os.listdir(segment_folder) if name.startswith("source_"))
+
+			segmented_text = self.language["conversionTab"].get("segmentedEncoding").format(count=len(segments))
+			self.progress_aggregator.update(input_file, "segmenting", lambda: (f"{segmented_text}: {input_file}", self.update_file_progress(input_file, 0)))
+
+			progresses = [ConversionProgress(0) for _ in segments]
+			futures = []
+			segment_executor = ThreadPoolExecutor(max_workers=1 + spare_workers)
+			for segment, progress in zip(segments, progresses):
+				command = [
+					"ffmpeg", "-y",
+					"-i", os.path.join(segment_folder, f"source_{segment}"),
+					*planner.get_video_arguments(),
+					"-an",
+					os.path.join(segment_folder, f"encoded_{segment}")
+				]
+				futures.append(segment_executor.submit(
+					self.run_ffmpeg, command, progress,
+					lambda: self.report_progress(input_file, ConversionProgress.combine(duration, progresses))
+				))
+
+			audio_file = os.path.join(segment_folder, "audio.mka")
+			if audio_stream is not None:
+				futures.append(segment_executor.submit(self.run_ffmpeg, [
+					"ffmpeg", "-y",
+					"-i", input_file,
+					"-map", f"0:{audio_stream['index']}",
+					"-vn",
+					*planner.get_audio_arguments(),
+					audio_file
+				]))
+
+			# Every process is waited for before failing, so none of them still writes to the folder when it is removed.
+			wait(futures)
+			segment_executor.shutdown()
+			for future in futures:
+				future.result()
+
+			list_file = os.path.join(segment_folder, "segments.txt")
+			with open(list_file, 'w', encoding='utf-8') as f:
+				f.writelines(f"file 'encoded_{segment}'\n" for segment in segments)
+
+			command = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_file]
+			if audio_stream is not None:
+				command += ["-i", audio_file, "-map", "0:v:0", "-map", "1:a:0"]
+			else:
+				command += ["-map", "0:v:0"]
+			self.run_ffmpeg(command + ["-c", "copy", output_file])
+		finally:
+			shutil.rmtree(segment_folder, ignore_errors=True)
+			if spare_workers:
+				self.release_worker(worker_cost * spare_workers)
+
+	def set_job_state(self, state):
+		if self.journal_manager:
+			self.journal_manager.set_job_state(self.job_id, state)
+
+	def set_item_state(self, input_file, state):
+		if self.journal_manager:
+			self.journal_manager.set_item_state(self.job_id, input_file, state)
+
+	def get_segment_worker_count(self):
+		"""
+			Returns the largest number of segments of a long video encoded at the same time, when the shared worker budget
+			has room for them. Like video presets in `get_worker_count`, every encoder is given about four cores.
+		"""
+		return max(1, (os.cpu_count() or 1) // 4)
+
+	def get_worker_count(self):
+		"""
+			Returns the number of FFmpeg processes allowed to run at the same time.
+			Uses the "conversionWorkers" setting when set, otherwise derives it from the CPU count.
+			Video encoders are already multi-threaded, so video presets get fewer parallel jobs than audio presets.
+		"""
+		worker_count = int(self.settings.get("conversionWorkers", 0))
+		if worker_count > 0:
+			return worker_count
+
+		cpu_count = os.cpu_count() or 1
+		preset_types = [self.conversion_preset[preset_name].get("presetType") for preset_name in self.selected_presets]
+		if "video" in preset_types:
+			return max(1, cpu_count // 4)
+		return cpu_count
+
+	def update_file_progress(self, input_file, percent):
+		""" Records the progress of a single file and returns the aggregate progress of the batch. """
+		with self.progress_lock:
+			self.file_progress[input_file] = percent
+			return int(sum(self.file_progress.values()) / len(self.file_progress))
+
+	def get_output_file(self, media_input, preset_name=None):
+		"""
+			Generate output file name based on input file name and conversion settings.
+			When several presets are selected, video outputs are named after their preset so they do not overwrite each other.
+			The files of a split source are named after the source, without the format suffix of their stream.
+		"""
+		preset_name = preset_name or self.selected_preset
+		preset = self.conversion_preset[preset_name]
+		preset_type = preset.get("presetType", [])
+		input_files = self.get_input_files(media_input)
+		filename, _ = os.path.splitext(os.path.basename(input_files[0]))
+		if len(input_files) > 1:
+			filename = self.STREAM_SUFFIX.sub("", filename)
+		output_ext = preset.get("outputFormat", "mp4")
+
+		if preset_type == "audio":
+			bitrate_description = preset.get("audioBitrate", "audio")
+			output_file = os.path.join(self.destination, f"{filename} - {bitrate_description}.{output_ext}")
+		elif len(self.selected_presets) > 1:
+			output_file = os.path.join(self.destination, f"{filename} - {preset_name}.{output_ext}")
+		else:
+			output_file = os.path.join(self.destination, f"{filename}.{output_ext}")
+		return output_file
+
+	def track_progress(self, command, input_file):
+		"""
+			Runs the FFmpeg command and reports its progress through the machine-readable `-progress` channel.
+			Each progress block is parsed into a ConversionProgress carrying percent, encode speed and ETA.
+			Raises a RuntimeError with FFmpeg's error output if the process fails.
+		"""
+		progress = ConversionProgress(self.get_duration(input_file))
+		self.run_ffmpeg(command, progress, lambda: self.report_progress(input_file, progress))
+
+	def report_progress(self, input_file, progress):
+		""" Records the progress of a file and reports it through the progress aggregator. """
+		total_percent = self.update_file_progress(input_file, progress.percent or 0)
+		file_name = os.path.basename(input_file)
+		self.progress_aggregator.update(input_file, "processing", lambda: self.format_conversion_progress(progress, file_name, total_percent))
+
+	def run_ffmpeg(self, command, progress=None, on_progress=None):
+		"""
+			Runs an FFmpeg command with its machine-readable `-progress` output on stdout.
+			Every progress report is parsed into `progress` and followed by a call to `on_progress`, when they are given.
+			The error output is drained by a separate thread, so FFmpeg never blocks on a full stderr pipe.
+			Raises a RuntimeError with FFmpeg's error output if the process fails.
+		"""
+		command = command[:1] + ["-progress", "pipe:1", "-nostats", "-loglevel", "error"] + command[1:]
+
+		creation_flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+
+		process = subprocess.Popen(
+			command, 
+			stdout=subprocess.PIPE, 
+			stderr=subprocess.PIPE,
+			bufsize=1,
+			universal_newlines=True,
+			text=True,
+			encoding="utf-8",
+			errors="replace",
+			creationflags=creation_flags
+		)
+		with self.process_lock:
+			self.processes.add(process)
+		if self.cancelled.is_set():
+			process.kill()
+
+		error_lines = []
+		error_reader = threading.Thread(target=lambda: error_lines.extend(process.stderr), daemon=True)
+		error_reader.start()
+
+		for line in process.stdout:
+			if progress is not None and progress.update(line) and on_progress:
+				on_progress()
+
+		error_reader.join()
+		error_output = "".join(error_lines).strip()
+		return_code = process.wait()
+		with self.process_lock:
+			self.processes.discard(process)
+		if self.cancelled.is_set():
+			raise RuntimeError("Conversion cancelled")
+		if return_code != 0:
+			raise RuntimeError(error_output.splitlines()[-1] if error_output else f"FFmpeg exited with code {process.returncode}")
+
+	def format_conversion_progress(self, progress, file_name, total_percent):
+		"""
+			Builds the localized conversion progress message for a file from its ConversionProgress.
+			Only called when the progress aggregator actually emits the update.
+		"""
+		if progress.percent is None:
+			details = self.language["conversionTab"].get("processingNoDuration").format(
+				time=ConversionProgress.format_time(progress.out_time),
+				speed=f"{progress.speed:.2f}"
+			)
+		else:
+			details = self.language["conversionTab"].get("processingDetails").format(
+				percent=progress.percent,
+				speed=f"{progress.speed:.2f}",
+				eta=ConversionProgress.format_time(progress.eta)
+			)
+
+		conversion_processing = self.language["conversionTab"].get("processing")
+		return f"{conversion_processing}: {file_name}, {details}", total_percent
+
+	def get_duration(self, input_file):
+		"""Retrieves total duration of the media file in seconds from the metadata cache, probing it with FFprobe if needed."""
+		return self.metadata_manager.load_metadata(input_file).get("duration", 0)
+
+	def remove_file(self, input_file):
+		try:
+			if os.path.exists(input_file):
+				os.remove(input_file)
+				deleted_original = self.language["conversionTab"].get("deletedOriginal")
+				self.emit_progress(f"{deleted_original}: {input_file}", 0, "deleted")
+			else:
+				original_not_found = self.language["conversionTab"].get("originalNotFound")
+				self.emit_progress(f"{original_not_found}: {input_file}", 0, "error")
+		except Exception as e:
+			self.emit_progress(f"Error deleting file {input_file}: {e}", 0, "error")
+
+	def emit_progress(self, message, percent, status):
+		"""
+			Reports progress updates to the progress callback.
+			Passes the message, percentage progress, and current status.
+			Used for updating the UI or the console with conversion or processing progress.
+		"""
+		if self.progress_callback:
+			self.progress_callback(message, percent, status)
+
+	def emit_completion(self, message):
+		if self.completion_callback:
+			self.completion_callback(message)
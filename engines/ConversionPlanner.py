@@ -0,0 +1,215 @@
+class ConversionPlanner:
+	"""
+		Plans the FFmpeg command for one input file from its probed metadata and a conversion preset.
+		Streams that already match the preset are copied instead of being decoded and encoded again,
+		filters that would not change anything are left out, and only the streams the output needs are mapped.
+		The preset width and height act as a bounding box: sources are scaled down to fit it, never up.
+		A source may be split over several inputs, such as the separate video and audio streams of a download:
+		every probed stream then carries the "input" it belongs to, and all inputs are merged into the output.
+	"""
+	ENCODER_CODECS = {
+		"libx264": "h264",
+		"h264": "h264",
+		"libx265": "hevc",
+		"hevc": "hevc",
+		"libvpx-vp9": "vp9",
+		"libaom-av1": "av1",
+		"libsvtav1": "av1",
+		"aac": "aac",
+		"libfdk_aac": "aac",
+		"libmp3lame": "mp3",
+		"mp3": "mp3",
+		"libopus": "opus",
+		"libvorbis": "vorbis",
+		"flac": "flac"
+	}
+	BITRATE_TOLERANCE = 1.1
+	FPS_TOLERANCE = 0.01
+
+	def __init__(self, preset, metadata, inputs=1):
+		self.preset = preset
+		self.metadata = metadata or {}
+		self.inputs = inputs
+
+	def get_stream(self, codec_type):
+		""" Returns the first probed stream of the given type, ignoring embedded cover art, or None. """
+		for stream in self.metadata.get("streams", []):
+			if stream.get("codecType") == codec_type and not stream.get("attachedPicture"):
+				return stream
+		return None
+
+	@staticmethod
+	def parse_bitrate(bitrate):
+		""" Converts an FFmpeg bitrate such as "192k" or "2.5M" to bits per second. """
+		multipliers = {"k": 1000, "m": 1000000}
+		value = str(bitrate).strip().lower()
+		try:
+			if value and value[-1] in multipliers:
+				return float(value[:-1]) * multipliers[value[-1]]
+			return float(value)
+		except ValueError:
+			return None
+
+	def matches_codec(self, stream, encoder):
+		return stream.get("codecName") == self.ENCODER_CODECS.get(encoder, encoder)
+
+	def within_bitrate(self, stream, bitrate):
+		""" Returns True unless the stream is known to exceed the preset bitrate. """
+		target = self.parse_bitrate(bitrate)
+		source = stream.get("bitRate")
+		return not target or not source or source <= target * self.BITRATE_TOLERANCE
+
+	def can_copy_video(self):
+		""" Returns True if the source video stream already has the preset codec and fits its resolution, frame rate and bitrate. """
+		stream = self.get_stream("video")
+		if stream is None:
+			return False
+
+		return (
+			self.matches_codec(stream, self.preset.get("videoCodec", "libx264"))
+			and not self.needs_scale(stream)
+			and not self.needs_frame_rate(stream)
+			and self.within_bitrate(stream, self.preset.get("videoBitrate", "5M"))
+		)
+
+	def can_copy_audio(self):
+		""" Returns True if the source audio stream already has the preset codec, channel count and bitrate. """
+		stream = self.get_stream("audio")
+		if stream is None:
+			return False
+
+		return (
+			self.matches_codec(stream, self.preset.get("audioCodec", "aac"))
+			and not self.needs_channels(stream)
+			and self.within_bitrate(stream, self.preset.get("audioBitrate", "192k"))
+		)
+
+	def can_remux(self):
+		"""
+			Returns True if no stream needs to be transcoded for this preset.
+			Video presets need a matching video stream and, when the source has audio, a matching audio stream.
+			Audio presets only need a matching audio stream.
+		"""
+		if self.preset.get("presetType") == "video":
+			return self.can_copy_video() and (self.get_stream("audio") is None or self.can_copy_audio())
+		return self.can_copy_audio()
+
+	def needs_scale(self, stream):
+		""" Returns True if the video stream is larger than the preset size, or its size is unknown. """
+		width, height = stream.get("width"), stream.get("height")
+		if not width or not height:
+			return True
+		return width > self.preset.get("width", 1920) or height > self.preset.get("height", 1080)
+
+	def needs_frame_rate(self, stream):
+		""" Returns True if the video stream is faster than the preset frame rate, or its frame rate is unknown. """
+		frame_rate = stream.get("frameRate")
+		return not frame_rate or frame_rate > self.preset.get("fps", 30) + self.FPS_TOLERANCE
+
+	def needs_channels(self, stream):
+		""" Returns True if the audio stream channel count differs from the preset, or is unknown. """
+		return stream.get("channels") != self.preset.get("audioChannels", 2)
+
+	def has_video(self):
+		""" Returns True if the output of a video preset gets a video stream: the source has one, or it was not probed. """
+		return self.preset.get("presetType") == "video" and (self.get_stream("video") is not None or not self.metadata)
+
+	def get_stream_arguments(self):
+		"""
+			Maps only the streams the output needs: the main video stream for video presets and the main audio stream.
+			A source without a video stream, apart from cover art, is converted to audio only even with a video preset.
+			Without metadata, the video is taken from the first input, if it has one, and the audio from the last one.
+		"""
+		video_stream = self.get_stream("video")
+		audio_stream = self.get_stream("audio")
+
+		arguments = []
+		if not self.has_video():
+			arguments += ["-vn"]
+		elif video_stream is not None:
+			arguments += ["-map", self.get_stream_specifier(video_stream)]
+		else:
+			arguments += ["-map", "0:v:0?"]
+
+		if audio_stream is not None:
+			arguments += ["-map", self.get_stream_specifier(audio_stream)]
+		elif not self.metadata:
+			arguments += ["-map", f"{self.inputs - 1}:a:0?"]
+		return arguments
+
+	@staticmethod
+	def get_stream_specifier(stream):
+		return f"{stream.get('input', 0)}:{stream['index']}"
+
+	def get_video_arguments(self):
+		"""
+			Returns the video encoding arguments for video presets.
+			Copies the stream when it already matches, otherwise only adds the scale filter and frame rate
+			when the source is larger or faster than the preset. Scaling keeps the source aspect ratio.
+		"""
+		if not self.has_video():
+			return []
+		if self.can_copy_video():
+			return ["-c:v", "copy"]
+
+		stream = self.get_stream("video") or {}
+		arguments = []
+		if self.needs_scale(stream):
+			width = self.preset.get("width", 1920)
+			height = self.preset.get("height", 1080)
+			arguments += ["-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease:force_divisible_by=2"]
+
+		arguments += [
+			"-c:v", self.preset.get("videoCodec", "libx264"),
+			"-b:v", self.preset.get("videoBitrate", "5M")
+		]
+
+		if self.needs_frame_rate(stream):
+			arguments += ["-r", str(self.preset.get("fps", 30))]
+		return arguments
+
+	def get_audio_arguments(self):
+		""" Returns the audio encoding arguments, copying the stream when it already matches the preset. """
+		stream = self.get_stream("audio")
+		if stream is None and self.metadata:
+			return []
+		if self.can_copy_audio():
+			return ["-c:a", "copy"]
+
+		arguments = [
+			"-c:a", self.preset.get("audioCodec", "aac"),
+			"-b:a", self.preset.get("audioBitrate", "192k")
+		]
+		if stream is None or self.needs_channels(stream):
+			arguments += ["-ac", str(self.preset.get("audioChannels", 2))]
+		return arguments
+
+	def get_output_arguments(self, output_file):
+		""" Returns the FFmpeg arguments writing the output file with the preset, ending with the output file itself. """
+		return [
+			*self.get_stream_arguments(),
+			*self.get_video_arguments(),
+			*self.get_audio_arguments(),
+			output_file
+		]
+
+	@staticmethod
+	def get_input_arguments(input_files):
+		""" Returns the FFmpeg arguments opening the input file, or every file of a list of inputs. """
+		input_files = input_files if isinstance(input_files, (list, tuple)) else [input_files]
+		return [argument for input_file in input_files for argument in ("-i", input_file)]
+
+	def build_command(self, input_files, output_file):
+		""" Builds the FFmpeg command converting the input file, or list of inputs, to the output file with the preset. """
+		return ["ffmpeg", "-y", *self.get_input_arguments(input_files), *self.get_output_arguments(output_file)]
+
+	@staticmethod
+	def build_multi_output_command(input_files, outputs):
+		"""
+			Builds a single FFmpeg command writing several outputs from one input, given as (planner, output file) pairs.
+			FFmpeg decodes every input stream once and shares the decoded frames between the outputs.
+		"""
+		command = ["ffmpeg", "-y", *ConversionPlanner.get_input_arguments(input_files)]
+		for planner, output_file in outputs:
+			command += planner.get_output_arguments(output_file)
+		return command
@@ -0,0 +1,78 @@
+class ConversionProgress:
+	"""
+		Structured progress of a running FFmpeg process.
+		Built from the key=value blocks FFmpeg writes with `-progress`, one block per progress report.
+	"""
+
+	def __init__(self, total_duration):
+		self.total_duration = total_duration or 0
+		self.out_time = 0.0
+		self.fps = 0.0
+		self.speed = 0.0
+		self.total_size = 0
+		self.finished = False
+
+	def update(self, line):
+		"""
+			Applies a single "key=value" line of FFmpeg progress output.
+			Returns True when the line closes a progress block, meaning a complete report is available.
+		"""
+		key, separator, value = line.strip().partition("=")
+		if not separator:
+			return False
+
+		if key == "out_time_us":
+			self.out_time = self.parse_number(value, self.out_time * 1000000) / 1000000
+		elif key == "fps":
+			self.fps = self.parse_number(value, self.fps)
+		elif key == "speed":
+			self.speed = self.parse_number(value.rstrip("x"), self.speed)
+		elif key == "total_size":
+			self.total_size = int(self.parse_number(value, self.total_size))
+		elif key == "progress":
+			self.finished = value == "end"
+			return True
+		return False
+
+	@classmethod
+	def combine(cls, total_duration, progresses):
+		"""
+			Returns the progress of several FFmpeg processes working on parts of the same input, such as segments
+			encoded in parallel: the processed time, output size and speed of every part are added up.
+		"""
+		combined = cls(total_duration)
+		combined.out_time = sum(progress.out_time for progress in progresses)
+		combined.fps = sum(progress.fps for progress in progresses)
+		combined.speed = sum(progress.speed for progress in progresses)
+		combined.total_size = sum(progress.total_size for progress in progresses)
+		return combined
+
+	@property
+	def percent(self):
+		""" Percentage of the input processed so far, or None when the input duration is unknown. """
+		if self.finished:
+			return 100
+		if self.total_duration <= 0:
+			return None
+		return max(0, min(99, int(self.out_time / self.total_duration * 100)))
+
+	@property
+	def eta(self):
+		""" Estimated seconds until the conversion ends, or None when it cannot be estimated yet. """
+		if self.total_duration <= 0 or self.speed <= 0:
+			return None
+		return max(0.0, (self.total_duration - self.out_time) / self.speed)
+
+	def parse_number(self, value, default):
+		try:
+			return float(value)
+		except ValueError:
+			return default
+
+	@staticmethod
+	def format_time(seconds):
+		""" Formats a number of seconds as H:MM:SS. """
+		if seconds is None:
+			return "--:--:--"
+		seconds = int(seconds)
+		return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
@@ -0,0 +1,696 @@
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from managers.ArchiveManager import ArchiveManager
+from managers.ExtractorCacheManager import ExtractorCacheManager
+from managers.JournalManager import JournalManager
+from managers.ThroughputManager import ThroughputManager
+from engines.BandwidthScheduler import BandwidthScheduler
+from engines.HostLimiter import HostLimiter
+from engines.ProgressAggregator import ProgressAggregator
+
+class DownloadEngine:
+	"""
+		Downloads a single URL, or every entry of a playlist, with yt-dlp.
+		Does not depend on Qt: progress, finished files and completion are reported through plain callbacks,
+		so the engine runs the same inside the DownloadThread of the GUI and from the command line.
+		With `audio_only`, set when the files are converted with an audio preset, only the best audio stream is fetched.
+		With `split_streams`, set when the files are converted with a video preset, the video and audio streams are
+		downloaded as separate files and handed to the conversion together, which merges them while it converts.
+		yt-dlp is only imported by the methods that use it, so importing the engine does not slow down startup.
+	"""
+	ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+	THROTTLE_ERROR = re.compile(r'HTTP Error (429|403)')
+	THROTTLE_RETRIES = 3
+	AUDIO_ONLY_FORMAT = "bestaudio/best"
+	NATIVE_DOWNLOADER = "native"
+	# Smaller downloads finish before the connections ramp up, so their throughput says little about the concurrency.
+	MIN_MEASURED_SIZE = 1024 * 1024
+	# Width of the playlist index when the number of entries is not known up front, so the files still sort in order.
+	UNKNOWN_INDEX_WIDTH = 4
+
+	def __init__(self, url, destination, playlist, conversion, selected_preset, download_preset, language, settings, job_id=None,
+			audio_only=False, split_streams=False, progress_callback=None, conversion_callback=None, file_ready_callback=None,
+			completion_callback=None):
+		self.url = url
+		self.destination = destination
+		self.playlist = playlist
+		self.conversion = conversion
+		self.selected_preset = selected_preset
+		self.download_preset = download_preset
+		self.language = language
+		self.settings = settings
+		self.streaming_conversion = conversion and settings.get("streamingConversion", True)
+		self.audio_only = conversion and audio_only
+		self.split_streams = conversion and not self.audio_only and split_streams
+		self.job_id = job_id
+		self.journal_manager = JournalManager() if job_id is not None else None
+		self.failed = False
+		# Set by `cancel`: every download of the job, including the parallel playlist entries, stops at its next progress update.
+		self.cancelled = threading.Event()
+
+		self.total_video = 0
+		self.downloaded_video = 0
+		self.info = None
+		self.entries = None
+		self.cache_manager = ExtractorCacheManager(int(settings.get("extractorCacheTTL", 1800)))
+		self.counter_lock = threading.Lock()
+		self.progress_aggregator = ProgressAggregator(self.emit_progress)
+		self.file_types = {}
+		self.format_choice = None
+
+		self.throughput_manager = ThroughputManager()
+		self.host = HostLimiter.get_host(url)
+		self.downloader = self.NATIVE_DOWNLOADER
+		self.fragment_concurrency = 1
+		self.adaptive_throughput = False
+		self.fragmented_files = set()
+
+		self.bandwidth_scheduler = BandwidthScheduler(settings)
+		self.bandwidth_job = None
+		self.received_bytes = {}
+
+		self.host_limiter = HostLimiter(settings)
+		# Number of host slots taken by the downloads of this job, given back by `release_host_slots` if it is stopped.
+		self.held_host_slots = 0
+		# Size and paths of the files finished by the download running in the current thread, and whether its streams are split.
+		self.current_download = threading.local()
+		self.archive_manager = ArchiveManager() if settings.get("downloadArchive", True) else None
+
+		self.downloaded_files = []
+
+		self.progress_callback = progress_callback
+		self.conversion_callback = conversion_callback
+		self.file_ready_callback = file_ready_callback
+		self.completion_callback = completion_callback
+
+	def run(self):
+		"""
+			Executes the download process, emitting progress updates and handling exceptions.
+			Displays a success message upon completion or an error message if the download fails.
+			Updates the status based on whether a single video or an entire playlist was downloaded.
+			Records the job state in the journal, so an interrupted job is resumed on the next start.
+			While it runs, the job draws its bandwidth from the shared scheduler with the "bandwidthWeight" of its preset.
+			A cancelled job stops without a completion message and without starting the conversion.
+		"""
+		self.set_job_state("running")
+		weight = self.download_preset.get(self.selected_preset, {}).get("bandwidthWeight", 1)
+		self.bandwidth_job = self.bandwidth_scheduler.register(weight)
+		try:
+			ydl_opts = self.get_download_options()
+			if self.entries is not None:
+				self.download_playlist(ydl_opts)
+			else:
+				self.download_video(ydl_opts)
+		except Exception as e:
+			self.failed = True
+			if not self.cancelled.is_set():
+				self.cache_manager.remove_info(self.url, self.playlist)
+				error_message = self.language["downloadTab"].get("errorMessage")
+				self.emit_progress(f"{error_message}: {e}", 0, "error")
+		finally:
+			self.release_bandwidth()
+
+		self.progress_aggregator.flush()
+		if self.cancelled.is_set():
+			self.set_job_state("cancelled")
+			return
+		self.set_job_state("failed" if self.failed else "done")
+
+		if self.playlist and self.downloaded_video == self.total_video:
+			message = self.language["downloadTab"].get("playlistDownloadFinished")
+			self.emit_completion(f"{message}: {self.destination}")
+		elif not self.playlist:
+			message = self.language["downloadTab"].get("singleDownloadFinished")
+			self.emit_completion(f"{message}: {self.destination}")
+
+		if self.conversion and not self.streaming_conversion:
+			if self.downloaded_files:
+				message = self.language["downloadTab"].get("startingConversion")
+				self.emit_progress(message, 100, "conversion")
+				self.emit_conversion(self.downloaded_files)
+		else:
+			self.downloaded_files.clear()
+
+	def download_video(self, ydl_opts):
+		"""
+			Downloads the video using yt-dlp with the provided download options.
+			Reuses the info dict from `extract_info` so the URL is not extracted a second time.
+			A video already in the download archive is linked into the destination instead of downloaded again.
+		"""
+		archive_key = self.get_archive_key(self.info)
+		if self.reuse_archived_file(archive_key, self.destination, ""):
+			return
+
+		self.download_limited(ydl_opts, self.info)
+		self.archive_files(archive_key, "")
+
+	def download_playlist(self, ydl_opts):
+		"""
+			Downloads the playlist entries concurrently, several entries at a time.
+			Entries are enumerated lazily from the flat playlist result and each one is only resolved right before it downloads.
+			Every entry keeps the "%(playlist_index)s. %(title)s" file name of a regular playlist download.
+			The number of entries downloaded at once comes from the "playlistConcurrency" setting.
+			The index is padded to the number of entries, or to UNKNOWN_INDEX_WIDTH digits when the count is not known.
+		"""
+		import yt_dlp
+
+		index_width = len(str(self.total_video)) if self.total_video else self.UNKNOWN_INDEX_WIDTH
+		max_workers = max(1, int(self.settings.get("playlistConcurrency", 3)))
+		pending_slots = threading.BoundedSemaphore(max_workers * 2)
+		enumerated_entries = []
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			for index, entry in enumerate(self.entries, start=1):
+				if self.cancelled.is_set():
+					break
+				if not entry:
+					continue
+
+				enumerated_entries.append(entry)
+				with self.counter_lock:
+					self.total_video = max(self.total_video, len(enumerated_entries))
+
+				playlist_index = str(entry.get('playlist_index') or index).zfill(index_width)
+				pending_slots.acquire()
+				future = executor.submit(self.download_entry, ydl_opts, entry, playlist_index)
+				future.add_done_callback(lambda _: pending_slots.release())
+
+			with self.counter_lock:
+				self.total_video = len(enumerated_entries)
+
+			found_text = self.language["downloadTab"].get("playlistFound")
+			self.emit_progress(found_text.format(total_video=self.total_video), 0, "enumerated")
+
+			if not isinstance(self.entries, list):
+				self.info['entries'] = enumerated_entries
+				self.cache_manager.save_info(self.url, self.playlist, yt_dlp.YoutubeDL.sanitize_info(self.info))
+
+	def download_entry(self, ydl_opts, entry, playlist_index):
+		"""
+			Downloads a single playlist entry and updates the playlist counter once it is complete.
+			Flat entries are resolved here by `process_ie_result`, right before they download.
+			Entries the journal already records as done for this job are not downloaded again, and entries in the
+			download archive, fetched earlier for this or another playlist, are linked into the playlist folder.
+		"""
+		entry_key = str(entry.get('id') or entry.get('url') or playlist_index)
+		if self.cancelled.is_set():
+			return
+		if self.journal_manager and self.journal_manager.get_item_state(self.job_id, entry_key) == "done":
+			self.count_downloaded_entry()
+			return
+
+		self.set_item_state(entry_key, "running")
+		archive_key = self.get_archive_key(entry)
+		file_prefix = f"{playlist_index}. "
+		if self.reuse_archived_file(archive_key, self.playlist_folder, file_prefix):
+			self.set_item_state(entry_key, "done")
+			self.count_downloaded_entry()
+			return
+
+		entry_opts = dict(ydl_opts)
+		entry_opts.update({
+			'outtmpl': os.path.join(self.playlist_folder, f"{playlist_index}. %(title)s.%(ext)s"),
+			'noplaylist': True,
+		})
+
+		try:
+			self.download_limited(entry_opts, entry)
+			self.archive_files(archive_key, file_prefix)
+		except Exception as e:
+			self.failed = True
+			self.set_item_state(entry_key, "failed")
+			if self.cancelled.is_set():
+				return
+			error_message = self.language["downloadTab"].get("errorMessage")
+			self.emit_progress(f"{error_message}: {e}", 0, "error")
+			return
+
+		self.set_item_state(entry_key, "done")
+		self.count_downloaded_entry()
+
+	def download_limited(self, ydl_opts, info):
+		"""
+			Downloads an info dict with yt-dlp while holding a slot of the per-host limiter, so the host never gets more
+			downloads at once than its current limit. The throughput of the download is reported back to the limiter.
+			A download the host refused with HTTP 429 or 403 is retried after the back-off delay, up to THROTTLE_RETRIES times,
+			with the video extracted again, as the media URLs of the refused attempt may have expired.
+		"""
+		for attempt in range(self.THROTTLE_RETRIES + 1):
+			self.acquire_host_slot()
+			self.current_download.size = 0
+			self.current_download.files = []
+			self.current_download.split = False
+			started = time.monotonic()
+			throttled = False
+			try:
+				self.run_yt_dlp(ydl_opts, info)
+				return
+			except Exception as e:
+				throttled = bool(self.THROTTLE_ERROR.search(str(e)))
+				if not throttled or attempt == self.THROTTLE_RETRIES:
+					raise
+			finally:
+				elapsed = time.monotonic() - started
+				speed = self.current_download.size / elapsed if self.current_download.size >= self.MIN_MEASURED_SIZE and elapsed > 0 else None
+				backoff = self.release_host_slot(throttled, None if throttled else speed)
+
+			message = self.language["downloadTab"].get("hostThrottled")
+			self.emit_progress(message.format(host=self.host, seconds=backoff, limit=self.host_limiter.get_limit(self.host)), 0, "throttled")
+			info = self.refresh_info(info)
+
+	def refresh_info(self, info):
+		"""
+			Returns the info dict of a resolved video extracted again, with fresh media URLs, and drops the cached result.
+			Flat playlist entries are returned as is, since yt-dlp resolves them again on every attempt.
+		"""
+		import yt_dlp
+
+		video_url = info.get('webpage_url')
+		if 'formats' not in info or not video_url:
+			return info
+
+		if info is self.info:
+			self.cache_manager.remove_info(self.url, self.playlist)
+		with yt_dlp.YoutubeDL({'quiet': True, 'noplaylist': True}) as ydl:
+			return yt_dlp.YoutubeDL.sanitize_info(ydl.extract_info(video_url, download=False))
+
+	def acquire_host_slot(self):
+		self.host_limiter.acquire(self.host, self.report_host_wait, self.check_cancelled)
+		with self.counter_lock:
+			self.held_host_slots += 1
+
+	def release_host_slot(self, throttled=False, speed=None):
+		""" Gives a host slot taken by `acquire_host_slot` back to the limiter and returns the back-off delay of the host. """
+		with self.counter_lock:
+			if not self.held_host_slots:
+				return 0
+			self.held_host_slots -= 1
+		return self.host_limiter.release(self.host, throttled, speed)
+
+	def release_host_slots(self):
+		""" Gives back every host slot still held, for a job whose thread was stopped in the middle of a download. Safe to call more than once. """
+		while self.held_host_slots:
+			self.release_host_slot()
+
+	def run_yt_dlp(self, ydl_opts, info):
+		"""
+			Downloads an info dict with yt-dlp, drawing its bandwidth from the shared scheduler.
+			When the streams are split, the separately downloaded stream files are handed to the conversion as one input.
+		"""
+		import yt_dlp
+
+		if self.split_streams:
+			ydl_opts, info = self.get_split_options(ydl_opts, info)
+
+		with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+			self.bandwidth_scheduler.attach(self.bandwidth_job, ydl.params)
+			try:
+				ydl.process_ie_result(info, download=True)
+			finally:
+				self.bandwidth_scheduler.detach(self.bandwidth_job, ydl.params)
+
+		if self.current_download.split and self.current_download.files:
+			self.add_downloaded_file(list(self.current_download.files))
+
+	def get_split_options(self, ydl_opts, info):
+		"""
+			Resolves the formats the preset selects for a video and, when it merges several of them, returns options
+			downloading each one to its own "<name>.f<format_id>.<ext>" file instead, so the conversion merges and encodes
+			them in a single FFmpeg pass rather than yt-dlp writing a merged file first.
+			Returns the options and the resolved info dict, unchanged when a single format is selected.
+		"""
+		import yt_dlp
+
+		with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+			info = ydl.process_ie_result(dict(info), download=False)
+
+		requested_formats = info.get('requested_formats') or []
+		if len(requested_formats) < 2:
+			return ydl_opts, info
+
+		self.current_download.split = True
+		self.emit_progress(self.language["downloadTab"].get("splitStreams"), 0, "downloader")
+		split_opts = dict(ydl_opts)
+		split_opts.update({
+			'format': ",".join(requested_format['format_id'] for requested_format in requested_formats),
+			'outtmpl': self.get_stream_template(ydl_opts['outtmpl']),
+		})
+		return split_opts, info
+
+	@staticmethod
+	def get_stream_template(outtmpl):
+		""" Returns the output template of a stream downloaded on its own, named like the stream files yt-dlp merges. """
+		extension = ".%(ext)s"
+		if outtmpl.endswith(extension):
+			return f"{outtmpl[:-len(extension)]}.f%(format_id)s{extension}"
+		return f"{outtmpl}.f%(format_id)s"
+
+	def get_archive_key(self, info):
+		"""
+			Returns the download archive key of a video or flat playlist entry, or None if it cannot be archived.
+			The key holds the format selector of the download, so a video is only reused when it was downloaded with the
+			same formats, never a lower quality or audio-only file where another quality is expected.
+		"""
+		if not self.archive_manager:
+			return None
+		archive_key = ArchiveManager.get_key(info.get('extractor_key') or info.get('ie_key'), info.get('id'))
+		return f"{archive_key} {self.format_choice}" if archive_key else None
+
+	def reuse_archived_file(self, archive_key, folder, file_prefix):
+		"""
+			Links the archived file of a video into the folder, named with the given prefix, instead of downloading it.
+			The file is hardlinked, so a video shared by several playlists is stored once. The linked file is handed to
+			the conversion like a downloaded one. Returns False if the video is not archived or cannot be linked.
+		"""
+		archived = self.archive_manager.find_file(archive_key) if archive_key else None
+		if archived is None:
+			return False
+
+		archived_file, name = archived
+		target_file = os.path.join(folder, f"{file_prefix}{name}")
+		if not os.path.exists(target_file):
+			try:
+				self.archive_manager.link_file(archived_file, target_file)
+			except OSError:
+				return False
+			self.archive_manager.record_file(archive_key, target_file, name)
+
+		message = self.language["downloadTab"].get("alreadyDownloaded")
+		self.emit_progress(f"{message}: {target_file}", 100, "archived")
+		self.add_downloaded_file(target_file)
+		return True
+
+	def archive_files(self, archive_key, file_prefix):
+		"""
+			Records the files just downloaded by this thread in the download archive, without their playlist index.
+			Split streams are not archived, as no merged file of the video is kept.
+		"""
+		if not archive_key or getattr(self.current_download, 'split', False):
+			return
+
+		for file_path in getattr(self.current_download, 'files', []):
+			name = os.path.basename(file_path)
+			if file_prefix and name.startswith(file_prefix):
+				name = name[len(file_prefix):]
+			self.archive_manager.record_file(archive_key, file_path, name)
+
+	def report_host_wait(self, limit):
+		message = self.language["downloadTab"].get("waitingForHost")
+		self.emit_progress(message.format(host=self.host, limit=limit), 0, "waiting")
+
+	def count_downloaded_entry(self):
+		""" Increments the playlist counter and reports how many entries are downloaded. """
+		with self.counter_lock:
+			self.downloaded_video += 1
+			downloaded_video = self.downloaded_video
+
+		complete_text = self.language["downloadTab"].get("playlistCompleted")
+		message = complete_text.format(downloaded_video=downloaded_video, total_video=self.total_video)
+		self.emit_progress(message, 100, "finished")
+
+	def cancel(self):
+		""" Asks every download of the job to stop. The downloads abort at their next progress update; `run` then returns. """
+		self.cancelled.set()
+
+	def check_cancelled(self):
+		""" Raises DownloadCancelled once the job is cancelled, aborting the yt-dlp download whose hook calls it. """
+		if self.cancelled.is_set():
+			import yt_dlp
+			raise yt_dlp.utils.DownloadCancelled()
+
+	def release_bandwidth(self):
+		""" Gives the bandwidth share of the job back to the other downloads. Safe to call more than once. """
+		if self.bandwidth_job is not None:
+			self.bandwidth_scheduler.unregister(self.bandwidth_job)
+			self.bandwidth_job = None
+
+	def set_job_state(self, state):
+		if self.journal_manager:
+			self.journal_manager.set_job_state(self.job_id, state)
+
+	def set_item_state(self, key, state):
+		if self.journal_manager:
+			self.journal_manager.set_item_state(self.job_id, key, state)
+
+	def get_download_options(self):
+		"""
+			Retrieves the download options for yt-dlp based on the URL and user settings.
+			Constructs the save path, selects the download quality, and configures the options.
+			Returns a dictionary with the configured yt-dlp options for video download.
+		"""
+		info = self.info = self.extract_info()
+
+		if 'entries' in info:
+			playlist_title = info.get('title', 'unknown_playlist')
+			self.playlist_folder = os.path.join(self.destination, playlist_title)
+			self.save_path = os.path.join(self.playlist_folder, "%(playlist_index)s. %(title)s.%(ext)s")
+			if self.playlist:
+				self.entries = info['entries']
+				self.total_video = info.get('playlist_count') or 0
+		else:
+			video_title = info.get('title', 'unknown_title')
+			self.save_path = os.path.join(self.destination, f"{video_title}.%(ext)s")
+
+		selected_preset = self.download_preset[self.selected_preset]
+		default_download = "bestvideo[height<=1080]+bestaudio/best"
+		format_choice = selected_preset.get("format", default_download)
+		if self.audio_only:
+			# The conversion keeps only the audio, so the video stream is neither downloaded nor merged.
+			format_choice = self.AUDIO_ONLY_FORMAT
+			self.emit_progress(self.language["downloadTab"].get("audioOnlyDownload"), 0, "downloader")
+		self.format_choice = format_choice
+		if selected_preset.get("downloadSubtitles", False):
+			# Subtitles are written and embedded next to a merged file, so the streams are merged by yt-dlp as before.
+			self.split_streams = False
+		output_format = selected_preset.get("outputFormat", "webm")
+
+		download_options = {
+			'format': format_choice,
+			'outtmpl': self.save_path,
+			'progress_hooks': [self.progress_hook],
+			'post_hooks': [self.post_hook],
+			'noplaylist': not self.playlist,
+			'rm_temp_files': True,
+		}
+
+		download_options.update(self.get_downloader_options(selected_preset))
+
+		if selected_preset.get("downloadSubtitles", False) and not self.audio_only:
+			download_options.update({
+				'writesubtitles': True,
+				'embedsubtitles': selected_preset.get("embedsubtitles", False),
+				'allsubtitles': selected_preset.get("allSubtitles", False),
+				'subtitleslangs': None if selected_preset.get("allSubtitles", False) else ["en"]
+			})
+
+		return download_options
+
+	def get_downloader_options(self, selected_preset):
+		"""
+			Returns the yt-dlp options choosing the downloader backend and how many fragments of a DASH or HLS
+			stream are fetched at once, from the "downloader", "downloaderArgs", "throughputMode",
+			"concurrentFragments" and "httpChunkSize" keys of the download preset.
+			In the "adaptive" throughput mode the concurrency starts at "concurrentFragments" and is then tuned from
+			the throughput measured for the host, otherwise "concurrentFragments" is used as is. An external downloader that is not installed falls back
+			to the native one. The backend and concurrency used are reported in the log.
+		"""
+		import yt_dlp
+
+		downloader = selected_preset.get("downloader", self.NATIVE_DOWNLOADER)
+		if downloader != self.NATIVE_DOWNLOADER and not shutil.which(downloader):
+			message = self.language["downloadTab"].get("downloaderMissing")
+			self.emit_progress(message.format(downloader=downloader), 0, "downloader")
+			downloader = self.NATIVE_DOWNLOADER
+
+		self.downloader = downloader
+		self.adaptive_throughput = selected_preset.get("throughputMode") == "adaptive"
+		self.fragment_concurrency = max(1, int(selected_preset.get("concurrentFragments", 1)))
+		if self.adaptive_throughput:
+			self.fragment_concurrency = self.throughput_manager.get_concurrency(self.get_throughput_key(), self.fragment_concurrency)
+
+		options = {'concurrent_fragment_downloads': self.fragment_concurrency}
+
+		http_chunk_size = selected_preset.get("httpChunkSize")
+		if http_chunk_size:
+			options['http_chunk_size'] = yt_dlp.utils.parse_bytes(str(http_chunk_size))
+
+		if downloader != self.NATIVE_DOWNLOADER:
+			downloader_args = selected_preset.get("downloaderArgs")
+			if downloader_args is None and downloader == "aria2c":
+				downloader_args = ["-x", str(self.fragment_concurrency), "-s", str(self.fragment_concurrency)]
+			options['external_downloader'] = {'default': downloader}
+			if downloader_args:
+				options['external_downloader_args'] = {'default': list(downloader_args)}
+
+		downloader_name = self.language["downloadTab"].get("nativeDownloader") if downloader == self.NATIVE_DOWNLOADER else downloader
+		message = self.language["downloadTab"].get("downloaderInfo")
+		self.emit_progress(message.format(downloader=downloader_name, concurrency=self.fragment_concurrency), 0, "downloader")
+		return options
+
+	def get_throughput_key(self):
+		""" Returns the key of the throughput history: the same host is measured separately for every backend. """
+		return f"{self.downloader}:{self.host}"
+
+	def record_throughput(self, d):
+		"""
+			Records the throughput of a finished download in the host history when the throughput mode is adaptive.
+			Only fragmented streams and external downloaders are measured, as the concurrency has no effect on others.
+		"""
+		if not self.adaptive_throughput:
+			return
+		if d['filename'] not in self.fragmented_files and self.downloader == self.NATIVE_DOWNLOADER:
+			return
+
+		size = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+		elapsed = d.get('elapsed') or 0
+		if size >= self.MIN_MEASURED_SIZE and elapsed > 0:
+			self.throughput_manager.record_throughput(self.get_throughput_key(), self.fragment_concurrency, size / elapsed)
+
+	def extract_info(self):
+		"""
+			Extracts the info dict of the URL without downloading it.
+			Playlists are extracted flat and unprocessed, so their entries stay a lazy iterable of lightweight
+			references that `download_playlist` enumerates; they are cached once enumeration completes.
+			Results are cached on disk for "extractorCacheTTL" seconds, so re-queued or retried URLs skip extraction.
+			The returned dict is later passed to `process_ie_result` for the actual download.
+		"""
+		import yt_dlp
+
+		info = self.cache_manager.load_info(self.url, self.playlist)
+		if info is not None:
+			return info
+
+		if self.playlist:
+			with yt_dlp.YoutubeDL({'quiet': True, 'extract_flat': 'in_playlist'}) as ydl:
+				info = ydl.extract_info(self.url, download=False, process=False)
+				if info.get('_type') in ('playlist', 'multi_video'):
+					return info
+				info = ydl.process_ie_result(info, download=False)
+		else:
+			with yt_dlp.YoutubeDL({'quiet': True, 'noplaylist': True}) as ydl:
+				info = ydl.extract_info(self.url, download=False)
+
+		info = yt_dlp.YoutubeDL.sanitize_info(info)
+		self.cache_manager.save_info(self.url, self.playlist, info)
+		return info
+
+	def progress_hook(self, d):
+		"""
+			Processes the download progress and updates the UI with status, speed, and ETA.
+			Handles different download statuses (downloading, finished) and formats the message.
+			Updates go through the progress aggregator, which emits them at a bounded rate.
+		"""
+		self.check_cancelled()
+		current_status = d['status']
+
+		if current_status == 'downloading':
+			self.throttle(d)
+			if d.get('fragment_count'):
+				self.fragmented_files.add(d['filename'])
+			self.progress_aggregator.update(d['filename'], current_status, lambda: self.format_download_progress(d))
+
+		elif current_status == 'finished':
+			self.current_download.size = getattr(self.current_download, 'size', 0) + (d.get('total_bytes') or d.get('downloaded_bytes') or 0)
+			self.record_throughput(d)
+			message = self.language["downloadTab"].get("merging")
+			self.progress_aggregator.update(d['filename'], "merging", lambda: (message, 100))
+
+	def throttle(self, d):
+		""" Draws the bytes received since the last progress update of the file from the shared bandwidth scheduler. """
+		downloaded_bytes = d.get('downloaded_bytes') or 0
+		with self.counter_lock:
+			previous_bytes = self.received_bytes.get(d['filename'], 0)
+			self.received_bytes[d['filename']] = downloaded_bytes
+		self.bandwidth_scheduler.consume(self.bandwidth_job, downloaded_bytes - previous_bytes)
+
+	def format_download_progress(self, d):
+		"""
+			Builds the localized download progress message and percentage for a yt-dlp progress dict.
+			Only called when the progress aggregator actually emits the update.
+		"""
+		downloaded_bytes = d.get('downloaded_bytes') or 0
+		total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate')
+		percent_int = min(100, int(downloaded_bytes * 100 / total_bytes)) if total_bytes else 0
+
+		percent_str = self.ANSI_ESCAPE.sub('', d.get('_percent_str', '')).strip()
+		speed = self.ANSI_ESCAPE.sub('', d.get('_speed_str', '')).strip()
+		eta = self.ANSI_ESCAPE.sub('', d.get('_eta_str', '')).strip()
+
+		downloading_message = self.language["downloadTab"].get("downloading")
+		message = downloading_message.format(file_type=self.get_file_type(d['filename']),
+			percent_str=percent_str,
+			speed=speed,
+			eta=eta
+			)
+
+		allocation = self.bandwidth_scheduler.get_allocation(self.bandwidth_job)
+		if allocation:
+			import yt_dlp
+			allocation_message = self.language["downloadTab"].get("bandwidthAllocation")
+			message = f"{message}, {allocation_message.format(rate=yt_dlp.utils.format_bytes(allocation))}"
+		return message, percent_int
+
+	def get_file_type(self, file_name):
+		""" Returns the localized file type (video, audio or subtitle) of a downloaded file, cached per file name. """
+		file_type = self.file_types.get(file_name)
+		if file_type is None:
+			video_extensions = ('.mp4', '.avi', '.mov', '.mkv', '.flv')
+			subtitle_extensions = ('.ass', '.srt', '.sub', '.vtt')
+			if file_name.endswith(video_extensions):
+				file_type = self.language["downloadTab"].get("video")
+			elif file_name.endswith(subtitle_extensions):
+				file_type = self.language["downloadTab"].get("subtitle")
+			else:
+				file_type = self.language["downloadTab"].get("audio")
+			self.file_types[file_name] = file_type
+		return file_type
+
+	def post_hook(self, file_path):
+		"""
+			Called by yt-dlp with the final file path once a video is merged and post-processed.
+			Records the file for conversion, unless it is one of the split streams handed over together by `run_yt_dlp`.
+		"""
+		if hasattr(self.current_download, 'files'):
+			self.current_download.files.append(file_path)
+
+		if not getattr(self.current_download, 'split', False):
+			self.add_downloaded_file(file_path)
+
+	def add_downloaded_file(self, media_input):
+		"""
+			Records a downloaded file, or the list of stream files of a video, for conversion and, in streaming mode,
+			hands it to the conversion queue right away.
+		"""
+		with self.counter_lock:
+			if media_input in self.downloaded_files:
+				return
+			self.downloaded_files.append(media_input)
+
+		if self.streaming_conversion:
+			self.emit_file_ready(media_input)
+
+	def emit_progress(self, message, percent, status):
+		"""
+			Reports progress updates to the progress callback.
+			Passes the message, percentage progress, and current status.
+			Used for updating the UI or the console with download or processing progress.
+		"""
+		if self.progress_callback:
+			self.progress_callback(message, percent, status)
+
+	def emit_conversion(self, downloaded_files):
+		if self.conversion_callback:
+			self.conversion_callback(downloaded_files)
+
+	def emit_file_ready(self, media_input):
+		if self.file_ready_callback:
+			self.file_ready_callback(media_input)
+
+	def emit_completion(self, message):
+		if self.completion_callback:
+			self.completion_callback(message)
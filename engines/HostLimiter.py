@@ -0,0 +1,109 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+class HostLimiter:
+	"""
+		Process-wide limit on the number of downloads running at the same time against each host.
+		The limit of a host adapts: it drops by half and the host is paused for a growing back-off delay when it answers
+		with HTTP 429 or 403, it also drops by half when a download is much slower than the usual speed of the host,
+		and it grows by one step for every window of downloads that complete at full speed, up to "maxHostConcurrency".
+		Every host has its own limit, so a throttling site never slows down the downloads from other sites.
+	"""
+	INITIAL_LIMIT = 3
+	MIN_LIMIT = 1
+	# A download slower than this fraction of the usual speed of its host is treated as a throttling signal.
+	SLOW_RATIO = 0.5
+	# Weight of a new speed measurement in the running average of the host.
+	SMOOTHING = 0.3
+	MIN_BACKOFF = 5
+	MAX_BACKOFF = 120
+	CANCEL_INTERVAL = 1.0
+
+	# Shared by every instance, so the limits hold across every download thread of the process.
+	hosts = {}
+	condition = threading.Condition()
+
+	def __init__(self, settings):
+		self.settings = settings
+
+	@staticmethod
+	def get_host(url):
+		""" Returns the host a URL is limited under, so "www.example.com" and "example.com" share a limit. """
+		host = (urlparse(url).hostname or "").lower()
+		return host[4:] if host.startswith("www.") else host
+
+	def get_max_limit(self):
+		return max(self.MIN_LIMIT, int(self.settings.get("maxHostConcurrency", 8)))
+
+	def get_state(self, host):
+		""" Returns the state of the host, creating it on first use. Must be called with the condition held. """
+		state = self.hosts.get(host)
+		if state is None:
+			state = self.hosts[host] = {
+				"limit": float(min(self.INITIAL_LIMIT, self.get_max_limit())),
+				"active": 0,
+				"speed": 0.0,
+				"backoff": 0,
+				"pausedUntil": 0.0
+			}
+		return state
+
+	def get_limit(self, host):
+		""" Returns the number of downloads currently allowed at once for the host. """
+		with self.condition:
+			return max(self.MIN_LIMIT, min(int(self.get_state(host)["limit"]), self.get_max_limit()))
+
+	def acquire(self, host, wait_callback=None, cancel_check=None):
+		"""
+			Waits until the host has a free slot and is not paused, then takes the slot.
+			`wait_callback` is called once with the current limit if the call has to wait.
+			`cancel_check` is called at least every CANCEL_INTERVAL seconds while waiting, and may raise to stop waiting.
+		"""
+		with self.condition:
+			state = self.get_state(host)
+			waited = False
+			while True:
+				if cancel_check:
+					cancel_check()
+				delay = state["pausedUntil"] - time.monotonic()
+				limit = max(self.MIN_LIMIT, min(int(state["limit"]), self.get_max_limit()))
+				if delay <= 0 and state["active"] < limit:
+					break
+
+				if not waited and wait_callback:
+					wait_callback(limit)
+				waited = True
+				timeout = delay if delay > 0 else None
+				if cancel_check:
+					timeout = min(timeout or self.CANCEL_INTERVAL, self.CANCEL_INTERVAL)
+				self.condition.wait(timeout)
+
+			state["active"] += 1
+
+	def release(self, host, throttled=False, speed=None):
+		"""
+			Frees the slot taken by `acquire` and adapts the limit of the host: halves it and pauses the host when the
+			download was throttled or much slower than usual, otherwise raises it while downloads keep their speed.
+			`speed` is the throughput of the download in bytes per second, or None if it was not measured.
+			Returns the back-off delay in seconds the host is paused for, or 0.
+		"""
+		with self.condition:
+			state = self.get_state(host)
+			state["active"] = max(0, state["active"] - 1)
+			backoff = 0
+
+			if throttled:
+				state["limit"] = max(self.MIN_LIMIT, state["limit"] / 2)
+				backoff = state["backoff"] = min(self.MAX_BACKOFF, state["backoff"] * 2 or self.MIN_BACKOFF)
+				state["pausedUntil"] = time.monotonic() + backoff
+			elif speed:
+				if state["speed"] and speed < state["speed"] * self.SLOW_RATIO:
+					state["limit"] = max(self.MIN_LIMIT, state["limit"] / 2)
+				else:
+					state["limit"] = min(self.get_max_limit(), state["limit"] + 1 / int(state["limit"]))
+					state["backoff"] = 0
+				state["speed"] = speed if not state["speed"] else state["speed"] + (speed - state["speed"]) * self.SMOOTHING
+
+			self.condition.notify_all()
+			return backoff
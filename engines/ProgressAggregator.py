@@ -0,0 +1,55 @@
+import threading
+import time
+
+class ProgressAggregator:
+	"""
+		Coalesces progress updates coming from worker threads before they are emitted to the UI.
+		Keeps the latest in-flight update of every file and emits them at most `interval` seconds apart,
+		while state changes such as finished or error are always delivered right away.
+	"""
+	TRANSIENT_STATUSES = ("downloading", "processing")
+	DEFAULT_INTERVAL = 0.1
+
+	def __init__(self, emit, interval=DEFAULT_INTERVAL):
+		self.emit = emit
+		self.interval = interval
+		self.lock = threading.Lock()
+		self.pending = {}
+		self.last_emit = 0.0
+
+	def update(self, key, status, build):
+		"""
+			Records a progress update for the given file.
+			`build` is a callable returning the (message, percent) pair. It is only called when the update is
+			actually emitted, so formatting work is skipped for updates that get coalesced away.
+		"""
+		if status not in self.TRANSIENT_STATUSES:
+			with self.lock:
+				self.pending.pop(key, None)
+			message, percent = build()
+			self.emit(message, percent, status)
+			return
+
+		now = time.monotonic()
+		with self.lock:
+			self.pending[key] = (status, build)
+			if now - self.last_emit < self.interval:
+				return
+			self.last_emit = now
+			updates = list(self.pending.values())
+			self.pending.clear()
+
+		for status, build in updates:
+			message, percent = build()
+			self.emit(message, percent, status)
+
+	def flush(self):
+		""" Emits every pending update immediately. """
+		with self.lock:
+			updates = list(self.pending.values())
+			self.pending.clear()
+			self.last_emit = time.monotonic()
+
+		for status, build in updates:
+			message, percent = build()
+			self.emit(message, percent, status)
@@ -1,30 +1,29 @@
-import os
 import sys
-import subprocess
 
-from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget
+from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout
 from PySide6.QtGui import QFont
-from ui.DownloadTab import DownloadTab
-from ui.ConversionTab import ConversionTab
-from ui.SettingsTab import SettingsTab
 
-from managers.LanguageManager import LanguageManager
-from managers.PresetManager import PresetManager
-from managers.SettingsManager import SettingsManager
-from managers.ThemeManager import ThemeManager
+from managers.ConfigService import ConfigService
+from managers.JournalManager import JournalManager
 
 class MainWindow(QMainWindow):
-	def __init__(self):
+	"""
+		Main window holding the download, conversion and settings tabs.
+		Each tab is only built the first time it is shown, so the window appears without waiting for the other tabs.
+		Configuration changes are applied live. A language change rebuilds the tabs, but a tab with work in progress
+		is only rebuilt the next time it is shown while idle, so running jobs are never interrupted.
+	"""
+	DOWNLOAD_TAB = 0
+	CONVERSION_TAB = 1
+	SETTINGS_TAB = 2
+
+	def __init__(self, config_service):
 		super().__init__()
-		self.settings_manager = SettingsManager()
-		self.settings = self.settings_manager.load_settings()
-
-		self.language_manager = LanguageManager()
-		self.language = self.language_manager.load_language(self.settings["language"])
-
-		self.preset_manager = PresetManager()
-		self.download_preset = self.preset_manager.load_download_preset()
-		self.conversion_preset = self.preset_manager.load_conversion_preset()
+		self.config_service = config_service
+		self.settings = config_service.settings
+		self.language = config_service.language
+		self.download_preset = config_service.download_preset
+		self.conversion_preset = config_service.conversion_preset
 
 		self.setWindowTitle(self.language["windowTitle"])
 		self.setGeometry(100, 100, 500, 400)
@@ -33,32 +32,123 @@ class MainWindow(QMainWindow):
 		self.tab_widget.setTabPosition(QTabWidget.North)
 		self.tab_widget.setMovable(False)
 
-		self.download_tab = DownloadTab(self.download_preset, self.conversion_preset, self.language, self.settings)
-		self.conversion_tab = ConversionTab(self.conversion_preset, self.language, self.settings)
-		self.settings_tab = SettingsTab(self.download_preset, self.conversion_preset, self.language, self.settings)
-
-		self.tab_widget.addTab(self.download_tab, self.language["downloadTab"].get("title"))
-		self.tab_widget.addTab(self.conversion_tab, self.language["conversionTab"].get("title"))
-		self.tab_widget.addTab(self.settings_tab, self.language["settingsTab"].get("title"))
+		# Every tab starts as an empty container, filled by its builder the first time the tab is shown.
+		self.tabs = {}
+		self.stale_tabs = set()
+		self.tab_builders = {
+			self.DOWNLOAD_TAB: self.build_download_tab,
+			self.CONVERSION_TAB: self.build_conversion_tab,
+			self.SETTINGS_TAB: self.build_settings_tab
+		}
+		self.tab_widget.addTab(self.create_tab_container(), self.language["downloadTab"].get("title"))
+		self.tab_widget.addTab(self.create_tab_container(), self.language["conversionTab"].get("title"))
+		self.tab_widget.addTab(self.create_tab_container(), self.language["settingsTab"].get("title"))
+		self.tab_widget.currentChanged.connect(self.get_tab)
+		self.get_tab(self.tab_widget.currentIndex())
 
 		self.setCentralWidget(self.tab_widget)
 
+		self.config_service.settings_changed.connect(self.apply_settings)
+		self.config_service.presets_changed.connect(self.apply_presets)
+		self.config_service.language_changed.connect(self.apply_language)
+		self.config_service.theme_changed.connect(self.apply_theme)
+
+		if self.settings.get("jobJournal", True):
+			self.resume_jobs()
+
+	def create_tab_container(self):
+		container = QWidget()
+		layout = QVBoxLayout(container)
+		layout.setContentsMargins(0, 0, 0, 0)
+		return container
+
+	def get_tab(self, index):
+		""" Returns the tab at the given index, building it on first use and rebuilding it if it is stale and idle. """
+		tab = self.tabs.get(index)
+		if tab is not None and index in self.stale_tabs and not tab.is_busy():
+			self.stale_tabs.discard(index)
+			self.tab_widget.widget(index).layout().removeWidget(tab)
+			tab.hide()
+			tab.deleteLater()
+			tab = None
+
+		if tab is None and index in self.tab_builders:
+			tab = self.tabs[index] = self.tab_builders[index]()
+			self.tab_widget.widget(index).layout().addWidget(tab)
+		return tab
+
+	def build_download_tab(self):
+		from ui.DownloadTab import DownloadTab
+		return DownloadTab(self.download_preset, self.conversion_preset, self.language, self.settings)
+
+	def build_conversion_tab(self):
+		from ui.ConversionTab import ConversionTab
+		return ConversionTab(self.conversion_preset, self.language, self.settings)
+
+	def build_settings_tab(self):
+		from ui.SettingsTab import SettingsTab
+		return SettingsTab(self.download_preset, self.conversion_preset, self.language, self.settings, self.config_service)
+
+	def apply_settings(self):
+		for tab in self.tabs.values():
+			tab.apply_settings()
+
+	def apply_presets(self):
+		for tab in self.tabs.values():
+			tab.refresh_presets()
+
+	def apply_language(self):
+		""" Translates the window and rebuilds every tab, deferring the tabs that have work in progress. """
+		self.setWindowTitle(self.language["windowTitle"])
+		self.tab_widget.setTabText(self.DOWNLOAD_TAB, self.language["downloadTab"].get("title"))
+		self.tab_widget.setTabText(self.CONVERSION_TAB, self.language["conversionTab"].get("title"))
+		self.tab_widget.setTabText(self.SETTINGS_TAB, self.language["settingsTab"].get("title"))
+
+		self.stale_tabs.update(self.tabs)
+		for index in list(self.tabs):
+			self.get_tab(index)
+
+	def apply_theme(self):
+		apply_theme(QApplication.instance(), self.config_service)
+
+	def resume_jobs(self):
+		""" Resumes the jobs left unfinished by the last session, building only the tabs that have jobs to resume. """
+		journal_manager = JournalManager()
+		journal_manager.prune()
+		if journal_manager.get_unfinished_jobs("download"):
+			self.get_tab(self.DOWNLOAD_TAB).resume_downloads()
+		if journal_manager.get_unfinished_jobs("conversion"):
+			self.get_tab(self.CONVERSION_TAB).resume_conversions()
+
+
+def apply_theme(app, config_service):
+	""" Applies the theme and font size of the current settings to the entire application. """
+	if config_service.theme_stylesheet:
+		app.setStyleSheet(config_service.theme_stylesheet)
+
+	font_size = int(config_service.settings.get("fontSize", 12))
+	app.setFont(QFont("Arial", font_size))
+
+
+def create_application(argv):
+	"""
+		Creates the application and its main window, loading every configuration file once.
+		Returns the application and the window, which is not shown yet.
+	"""
+	app = QApplication(argv)
 
+	config_service = ConfigService()
+	apply_theme(app, config_service)
 
-app = QApplication(sys.argv)
+	window = MainWindow(config_service)
+	return app, window
 
-settings_manager = SettingsManager()
-settings = settings_manager.load_settings()
 
-theme_manager = ThemeManager()
-theme_name = settings["themeName"]
-theme_stylesheet = theme_manager.load_theme(theme_name)
-if theme_stylesheet:
-	app.setStyleSheet(theme_stylesheet)  # Apply theme to the entire application
+def main():
+	app, window = create_application(sys.argv)
+	window.show()
+	return app.exec()
 
-font_size = int(settings.get("fontSize", 12))
-app.setFont(QFont("Arial", font_size))
 
-window = MainWindow()
-window.show()
-app.exec()
\ No newline at end of file
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,72 @@
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+
+from managers.SettingsManager import SettingsManager
+
+class ArchiveManager:
+	"""
+		Persistent archive of downloaded videos, stored in an SQLite database in the config folder.
+		Videos are keyed by extractor and video ID, like the download archive of yt-dlp, followed by the format selector
+		they were downloaded with, so each quality is archived apart. Every key keeps the files
+		the video was saved to, so an archived video can be linked into a new folder instead of downloaded again.
+	"""
+	ARCHIVE_FILE = os.path.join(SettingsManager.CONFIG_FOLDER, 'archive.db')
+
+	def __init__(self):
+		os.makedirs(SettingsManager.CONFIG_FOLDER, exist_ok=True)
+		with closing(self.connect()) as connection, connection:
+			connection.execute("PRAGMA journal_mode=WAL")
+			connection.execute("""
+				CREATE TABLE IF NOT EXISTS files (
+					key TEXT NOT NULL,
+					path TEXT NOT NULL,
+					name TEXT NOT NULL,
+					updated REAL NOT NULL,
+					PRIMARY KEY (key, path)
+				)
+			""")
+
+	def connect(self):
+		""" Open a new connection. Connections are not shared, so every download thread can use the archive. """
+		return sqlite3.connect(self.ARCHIVE_FILE, timeout=30)
+
+	@staticmethod
+	def get_key(extractor, video_id):
+		""" Return the archive key of a video, or None if its extractor or ID is unknown. """
+		if not extractor or not video_id:
+			return None
+		return f"{str(extractor).lower()} {video_id}"
+
+	def find_file(self, key):
+		"""
+			Return the (path, name) of a file the video was saved to that still exists, or None.
+			`name` is the file name without the playlist index, so it can be given a new index in another playlist.
+			Records of files that no longer exist are removed.
+		"""
+		with closing(self.connect()) as connection, connection:
+			rows = connection.execute("SELECT path, name FROM files WHERE key = ? ORDER BY rowid", (key,)).fetchall()
+			for path, name in rows:
+				if os.path.isfile(path):
+					return path, name
+				connection.execute("DELETE FROM files WHERE key = ? AND path = ?", (key, path))
+		return None
+
+	def record_file(self, key, path, name):
+		""" Record that the video was saved to the given file. """
+		with closing(self.connect()) as connection, connection:
+			connection.execute(
+				"INSERT INTO files (key, path, name, updated) VALUES (?, ?, ?, ?) "
+				"ON CONFLICT (key, path) DO UPDATE SET name = excluded.name, updated = excluded.updated",
+				(key, os.path.abspath(path), name, time.time())
+			)
+
+	def link_file(self, source_file, target_file):
+		""" Hardlink an archived file to a new location, falling back to a copy across file systems. """
+		os.makedirs(os.path.dirname(os.path.abspath(target_file)), exist_ok=True)
+		try:
+			os.link(source_file, target_file)
+		except OSError:
+			shutil.copy2(source_file, target_file)
@@ -0,0 +1,145 @@
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from managers.LanguageManager import LanguageManager
+from managers.PresetManager import PresetManager
+from managers.SettingsManager import SettingsManager
+from managers.ThemeManager import ThemeManager
+
+class ConfigService(QObject):
+	"""
+		In-memory configuration of the application: settings, presets, the current language and the current theme.
+		Every file is loaded once and shared by the whole application. The service watches the files and reloads
+		one when it changes on disk, updating the shared dicts in place, so the tabs and running jobs that hold them
+		see the new values right away and the application never needs to restart.
+	"""
+	settings_changed = Signal()
+	presets_changed = Signal()
+	language_changed = Signal()
+	theme_changed = Signal()
+
+	# Editors often write a file in several steps, so changes are reloaded once the file has been quiet for a moment.
+	RELOAD_DELAY = 200
+
+	def __init__(self):
+		super().__init__()
+		self.settings_manager = SettingsManager()
+		self.preset_manager = PresetManager()
+		self.language_manager = LanguageManager()
+		self.theme_manager = ThemeManager()
+
+		self.settings = self.settings_manager.settings
+		self.download_preset = self.preset_manager.download_preset
+		self.conversion_preset = self.preset_manager.conversion_preset
+		self.language = self.language_manager.load_language(self.settings["language"])
+		self.theme_stylesheet = self.theme_manager.load_theme(self.settings["themeName"])
+
+		self.changed_files = set()
+		self.reload_timer = QTimer(self)
+		self.reload_timer.setSingleShot(True)
+		self.reload_timer.setInterval(self.RELOAD_DELAY)
+		self.reload_timer.timeout.connect(self.reload_changed_files)
+
+		self.watcher = QFileSystemWatcher(self)
+		self.watcher.fileChanged.connect(self.on_file_changed)
+		self.watch_files()
+
+	@staticmethod
+	def replace_contents(target, source):
+		"""
+			Replaces the contents of a shared dict in place, so every holder of the dict sees the new values.
+			New values are written before removed keys are deleted, so threads reading the dict meanwhile never see it empty.
+		"""
+		target.update(source)
+		for key in [key for key in target if key not in source]:
+			del target[key]
+
+	def get_watched_files(self):
+		return [
+			self.settings_manager.SETTINGS_FILE,
+			self.preset_manager.DOWNLOAD_PRESET_FILE,
+			self.preset_manager.CONVERSION_PRESET_FILE,
+			self.language_manager.get_language_file(self.settings["language"]),
+			self.theme_manager.get_theme_file(self.settings["themeName"])
+		]
+
+	def watch_files(self):
+		"""
+			Watches the configuration files in use. Called again after every reload, because a file replaced by
+			a new one (as most editors save) is no longer watched, and the language or theme file may have changed.
+		"""
+		watched_files = self.get_watched_files()
+		stale_files = [path for path in self.watcher.files() if path not in watched_files]
+		if stale_files:
+			self.watcher.removePaths(stale_files)
+
+		new_files = [path for path in watched_files if path not in self.watcher.files()]
+		if new_files:
+			self.watcher.addPaths(new_files)
+
+	def on_file_changed(self, path):
+		self.changed_files.add(path)
+		self.reload_timer.start()
+
+	def reload_changed_files(self):
+		"""
+			Reloads the configuration files changed on disk and applies them.
+			A file that cannot be read or parsed, for example while it is still being written, is kept as it was.
+		"""
+		changed_files, self.changed_files = self.changed_files, set()
+
+		try:
+			if self.settings_manager.SETTINGS_FILE in changed_files:
+				self.apply_settings(self.settings_manager.load_settings())
+
+			if self.preset_manager.DOWNLOAD_PRESET_FILE in changed_files or self.preset_manager.CONVERSION_PRESET_FILE in changed_files:
+				download_preset = self.preset_manager.load_download_preset()
+				conversion_preset = self.preset_manager.load_conversion_preset()
+				self.replace_contents(self.download_preset, download_preset)
+				self.replace_contents(self.conversion_preset, conversion_preset)
+				self.presets_changed.emit()
+
+			if self.language_manager.get_language_file(self.settings["language"]) in changed_files:
+				self.reload_language()
+
+			if self.theme_manager.get_theme_file(self.settings["themeName"]) in changed_files:
+				self.reload_theme()
+		except (OSError, ValueError, KeyError):
+			pass
+
+		self.watch_files()
+
+	def apply_settings(self, new_settings):
+		"""
+			Applies new settings to the shared settings dict, reloading the language and theme when they changed.
+			Does nothing if the settings are unchanged, such as when the watcher reports a save made by the service itself.
+		"""
+		if new_settings == self.settings:
+			return
+
+		old_settings = dict(self.settings)
+		self.replace_contents(self.settings, new_settings)
+
+		if self.settings.get("language") != old_settings.get("language"):
+			self.reload_language()
+		if self.settings.get("themeName") != old_settings.get("themeName") or self.settings.get("fontSize") != old_settings.get("fontSize"):
+			self.reload_theme()
+
+		self.watch_files()
+		self.settings_changed.emit()
+
+	def reload_language(self):
+		self.replace_contents(self.language, self.language_manager.load_language(self.settings["language"]))
+		self.language_changed.emit()
+
+	def reload_theme(self):
+		self.theme_stylesheet = self.theme_manager.load_theme(self.settings["themeName"])
+		self.theme_changed.emit()
+
+	def save_settings(self, new_settings):
+		""" Saves the settings to the settings file and applies them immediately. """
+		self.settings_manager.save_settings(new_settings)
+		self.apply_settings(new_settings)
+
+	def reset_settings(self):
+		""" Restores the default settings, saves them and applies them immediately. """
+		self.save_settings(dict(self.settings_manager.DEFAULT_SETTINGS))
@@ -0,0 +1,55 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from managers.SettingsManager import SettingsManager
+
+class ExtractorCacheManager:
+	CACHE_FOLDER = os.path.join(SettingsManager.CACHE_FOLDER, 'extractor')
+
+	def __init__(self, ttl):
+		self.ttl = ttl
+		os.makedirs(self.CACHE_FOLDER, exist_ok=True)
+
+	def get_cache_file(self, url, playlist):
+		""" Return the cache file path for the given URL and playlist mode. """
+		key = hashlib.sha256(f"{int(bool(playlist))}:{url}".encode('utf-8')).hexdigest()
+		return os.path.join(self.CACHE_FOLDER, f"{key}.json")
+
+	def load_info(self, url, playlist):
+		"""
+			Load the cached extractor result for the given URL.
+			Returns None if caching is disabled, nothing is cached or the entry is older than the TTL.
+		"""
+		if self.ttl <= 0:
+			return None
+
+		cache_file = self.get_cache_file(url, playlist)
+		try:
+			if time.time() - os.path.getmtime(cache_file) > self.ttl:
+				os.remove(cache_file)
+				return None
+			with open(cache_file, 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return None
+
+	def save_info(self, url, playlist, info):
+		""" Save the extractor result for the given URL. The info dict must be JSON serializable. """
+		if self.ttl <= 0:
+			return
+
+		cache_file = self.get_cache_file(url, playlist)
+		temp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+		with open(temp_file, 'w', encoding='utf-8') as f:
+			json.dump(info, f)
+		os.replace(temp_file, cache_file)
+
+	def remove_info(self, url, playlist):
+		""" Remove the cached extractor result for the given URL, if any. """
+		try:
+			os.remove(self.get_cache_file(url, playlist))
+		except OSError:
+			pass
@@ -0,0 +1,102 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from managers.SettingsManager import SettingsManager
+
+class JournalManager:
+	"""
+		Durable journal of download and conversion jobs, stored in an SQLite database in the config folder.
+		A job is one queued URL or one conversion batch; its items are the playlist entries or files it processes.
+		Every job and item moves through the queued, running, done and failed states, so unfinished work can be
+		resumed after a crash or restart without repeating the items that already finished.
+	"""
+	JOURNAL_FILE = os.path.join(SettingsManager.CONFIG_FOLDER, 'journal.db')
+	UNFINISHED_STATES = ("queued", "running")
+	RETENTION = 7 * 24 * 3600
+
+	def __init__(self):
+		os.makedirs(SettingsManager.CONFIG_FOLDER, exist_ok=True)
+		with closing(self.connect()) as connection, connection:
+			connection.execute("PRAGMA journal_mode=WAL")
+			connection.execute("""
+				CREATE TABLE IF NOT EXISTS jobs (
+					id INTEGER PRIMARY KEY AUTOINCREMENT,
+					kind TEXT NOT NULL,
+					source TEXT NOT NULL,
+					options TEXT NOT NULL,
+					state TEXT NOT NULL,
+					updated REAL NOT NULL
+				)
+			""")
+			connection.execute("""
+				CREATE TABLE IF NOT EXISTS items (
+					job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+					key TEXT NOT NULL,
+					state TEXT NOT NULL,
+					updated REAL NOT NULL,
+					PRIMARY KEY (job_id, key)
+				)
+			""")
+
+	def connect(self):
+		""" Open a new connection. Connections are not shared, so every worker thread can use the journal. """
+		connection = sqlite3.connect(self.JOURNAL_FILE, timeout=30)
+		connection.execute("PRAGMA foreign_keys=ON")
+		return connection
+
+	def add_job(self, kind, source, options):
+		""" Record a new queued job and return its id. """
+		with closing(self.connect()) as connection, connection:
+			cursor = connection.execute(
+				"INSERT INTO jobs (kind, source, options, state, updated) VALUES (?, ?, ?, 'queued', ?)",
+				(kind, source, json.dumps(options), time.time())
+			)
+			return cursor.lastrowid
+
+	def set_job_state(self, job_id, state):
+		with closing(self.connect()) as connection, connection:
+			connection.execute("UPDATE jobs SET state = ?, updated = ? WHERE id = ?", (state, time.time(), job_id))
+
+	def set_item_state(self, job_id, key, state):
+		""" Record the state of a single playlist entry or file of a job. """
+		with closing(self.connect()) as connection, connection:
+			connection.execute(
+				"INSERT INTO items (job_id, key, state, updated) VALUES (?, ?, ?, ?) "
+				"ON CONFLICT (job_id, key) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+				(job_id, key, state, time.time())
+			)
+
+	def get_item_state(self, job_id, key):
+		""" Return the recorded state of an item, or None if it was never recorded. """
+		with closing(self.connect()) as connection:
+			row = connection.execute("SELECT state FROM items WHERE job_id = ? AND key = ?", (job_id, key)).fetchone()
+		return row[0] if row else None
+
+	def get_unfinished_jobs(self, kind):
+		""" Return the queued or running jobs of the given kind as dicts with their id, source and options. """
+		with closing(self.connect()) as connection:
+			rows = connection.execute(
+				"SELECT id, source, options FROM jobs WHERE kind = ? AND state IN (?, ?) ORDER BY id",
+				(kind, *self.UNFINISHED_STATES)
+			).fetchall()
+		return [{"id": job_id, "source": source, "options": json.loads(options)} for job_id, source, options in rows]
+
+	def get_unfinished_items(self, job_id):
+		""" Return the keys of the items of a job that did not finish, in the order they were added. """
+		with closing(self.connect()) as connection:
+			rows = connection.execute(
+				"SELECT key FROM items WHERE job_id = ? AND state IN (?, ?) ORDER BY rowid",
+				(job_id, *self.UNFINISHED_STATES)
+			).fetchall()
+		return [row[0] for row in rows]
+
+	def prune(self):
+		""" Delete finished jobs older than the retention period, together with their items. """
+		with closing(self.connect()) as connection, connection:
+			connection.execute(
+				"DELETE FROM jobs WHERE state NOT IN (?, ?) AND updated < ?",
+				(*self.UNFINISHED_STATES, time.time() - self.RETENTION)
+			)
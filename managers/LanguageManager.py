@@ -14,15 +14,22 @@ class LanguageManager:
 		with open(self.LANGUAGES_CONFIG, 'r', encoding='utf-8') as f:
 			return json.load(f)
 
-	def load_language(self, selected_language):
+	def get_language_file(self, selected_language):
 		"""
-			Load the language file for the selected language.
+			Return the path of the language file for the selected language.
 			Raises a KeyError if the language is not supported.
 		"""
 		file_name = self.supported_languages.get(selected_language)
 		if not file_name:
 			raise KeyError(f"Language '{selected_language}' is not supported.")
 
-		file_path = os.path.join(self.LANGUAGE_FOLDER, file_name)
+		return os.path.join(self.LANGUAGE_FOLDER, file_name)
+
+	def load_language(self, selected_language):
+		"""
+			Load the language file for the selected language.
+			Raises a KeyError if the language is not supported.
+		"""
+		file_path = self.get_language_file(selected_language)
 		with open(file_path, 'r', encoding='utf-8') as f:
 			return json.load(f)
\ No newline at end of file
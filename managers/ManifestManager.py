@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from managers.SettingsManager import SettingsManager
+
+class ManifestManager:
+	CACHE_FOLDER = SettingsManager.CACHE_FOLDER
+	MANIFEST_FILE = os.path.join(CACHE_FOLDER, 'conversion_manifest.json')
+	SAMPLE_SIZE = 1024 * 1024
+
+	# Shared by every instance so concurrent conversion threads never overwrite each other's records.
+	jobs = None
+	lock = threading.Lock()
+
+	def __init__(self):
+		with self.lock:
+			if ManifestManager.jobs is None:
+				ManifestManager.jobs = self.load_manifest()
+
+	def load_manifest(self):
+		""" Load the conversion manifest from disk, or return an empty manifest. """
+		try:
+			with open(self.MANIFEST_FILE, 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return {}
+
+	def save_manifest(self):
+		""" Save the conversion manifest to disk. Must be called with the lock held. """
+		os.makedirs(self.CACHE_FOLDER, exist_ok=True)
+		temp_file = f"{self.MANIFEST_FILE}.{os.getpid()}.tmp"
+		with open(temp_file, 'w', encoding='utf-8') as f:
+			json.dump(self.jobs, f)
+		os.replace(temp_file, self.MANIFEST_FILE)
+
+	def get_input_fingerprint(self, input_file):
+		"""
+			Return a content fingerprint of a file: its size and modification time plus a hash of its first, middle and
+			last megabyte. The modification time catches edits that keep the size and leave the sampled parts unchanged.
+			Identical files that keep their modification time, such as hardlinks and copies made with it, get the same
+			fingerprint wherever they are stored, without hashing whole videos.
+		"""
+		stat = os.stat(input_file)
+		size = stat.st_size
+		digest = hashlib.sha256()
+		with open(input_file, 'rb') as f:
+			for offset in (0, max(0, size // 2 - self.SAMPLE_SIZE // 2), max(0, size - self.SAMPLE_SIZE)):
+				f.seek(offset)
+				digest.update(f.read(self.SAMPLE_SIZE))
+		# Whole seconds, so copies on file systems with a coarser timestamp resolution keep the same fingerprint.
+		return f"{size}:{int(stat.st_mtime)}:{digest.hexdigest()}"
+
+	def get_job_key(self, input_file, preset):
+		""" Return the key identifying the conversion of this input content with this preset. """
+		preset_hash = hashlib.sha256(json.dumps(preset, sort_keys=True).encode('utf-8')).hexdigest()
+		return f"{self.get_input_fingerprint(input_file)}:{preset_hash}"
+
+	def is_valid_output(self, output_file, record):
+		""" Return True if the output still exists unchanged since it was recorded. """
+		try:
+			stat = os.stat(output_file)
+		except OSError:
+			return False
+		return stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime"]
+
+	def find_outputs(self, job_key):
+		""" Return the recorded outputs of a job that still exist unchanged, as a list of paths. """
+		with self.lock:
+			records = dict(self.jobs.get(job_key, {}))
+		return [output_file for output_file, record in records.items() if self.is_valid_output(output_file, record)]
+
+	def record_output(self, job_key, output_file):
+		""" Record that the output file was produced by the given job. """
+		output_file = os.path.abspath(output_file)
+		stat = os.stat(output_file)
+		with self.lock:
+			for records in self.jobs.values():
+				records.pop(output_file, None)
+			self.jobs.setdefault(job_key, {})[output_file] = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+			self.save_manifest()
+
+	def link_output(self, source_file, output_file):
+		""" Hardlink an existing output to a new location, falling back to a copy across file systems. """
+		os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+		if os.path.exists(output_file):
+			os.remove(output_file)
+		try:
+			os.link(source_file, output_file)
+		except OSError:
+			shutil.copy2(source_file, output_file)
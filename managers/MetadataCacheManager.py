@@ -0,0 +1,131 @@
+import json
+import os
+import subprocess
+import threading
+
+from managers.SettingsManager import SettingsManager
+
+class MetadataCacheManager:
+	CACHE_FOLDER = SettingsManager.CACHE_FOLDER
+	CACHE_FILE = os.path.join(CACHE_FOLDER, 'metadata.json')
+	MAX_ENTRIES = 5000
+
+	# Shared by every instance so the prober and the conversion threads see the same entries.
+	entries = None
+	lock = threading.Lock()
+
+	def __init__(self):
+		with self.lock:
+			if MetadataCacheManager.entries is None:
+				MetadataCacheManager.entries = self.load_cache()
+
+	def load_cache(self):
+		""" Load the metadata cache from disk, or return an empty cache. """
+		try:
+			with open(self.CACHE_FILE, 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return {}
+
+	def save_cache(self):
+		""" Save the metadata cache to disk, keeping only the most recent entries. """
+		os.makedirs(self.CACHE_FOLDER, exist_ok=True)
+		with self.lock:
+			keys = list(self.entries)
+			for key in keys[:-self.MAX_ENTRIES]:
+				del self.entries[key]
+
+			temp_file = f"{self.CACHE_FILE}.{os.getpid()}.tmp"
+			with open(temp_file, 'w', encoding='utf-8') as f:
+				json.dump(self.entries, f)
+			os.replace(temp_file, self.CACHE_FILE)
+
+	def get_fingerprint(self, input_file):
+		""" Return the path, size and modification time identifying the current version of a file. """
+		stat = os.stat(input_file)
+		return os.path.abspath(input_file), stat.st_size, stat.st_mtime_ns
+
+	def get_cached_metadata(self, input_file):
+		""" Return the cached metadata of a file, or None if it was never probed or has changed since. """
+		try:
+			path, size, mtime = self.get_fingerprint(input_file)
+		except OSError:
+			return None
+
+		with self.lock:
+			entry = self.entries.get(path)
+		if entry and entry["size"] == size and entry["mtime"] == mtime:
+			return entry["metadata"]
+		return None
+
+	def load_metadata(self, input_file):
+		"""
+			Return the metadata of a media file: duration, container and streams with their codecs.
+			Uses the cache when the file is unchanged, otherwise probes it with FFprobe and caches the result.
+			Returns an empty dict if the file cannot be probed.
+		"""
+		metadata = self.get_cached_metadata(input_file)
+		if metadata is not None:
+			return metadata
+
+		metadata = self.probe_metadata(input_file)
+		if metadata:
+			path, size, mtime = self.get_fingerprint(input_file)
+			with self.lock:
+				self.entries.pop(path, None)
+				self.entries[path] = {"size": size, "mtime": mtime, "metadata": metadata}
+		return metadata
+
+	def probe_metadata(self, input_file):
+		""" Probe a media file with FFprobe and return its duration, format and stream information. """
+		command = [
+			"ffprobe", "-v", "quiet", "-print_format", "json",
+			"-show_format", "-show_streams", input_file
+		]
+		creation_flags = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+		result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+			encoding="utf-8", errors="replace", creationflags=creation_flags)
+
+		try:
+			probe = json.loads(result.stdout)
+		except ValueError:
+			return {}
+		if not probe.get("streams"):
+			return {}
+
+		media_format = probe.get("format", {})
+		streams = []
+		for stream in probe.get("streams", []):
+			streams.append({
+				"index": stream.get("index"),
+				"codecType": stream.get("codec_type"),
+				"codecName": stream.get("codec_name"),
+				"width": stream.get("width"),
+				"height": stream.get("height"),
+				"frameRate": self.parse_frame_rate(stream.get("avg_frame_rate")),
+				"channels": stream.get("channels"),
+				"sampleRate": self.parse_number(stream.get("sample_rate")),
+				"bitRate": self.parse_number(stream.get("bit_rate")),
+				"attachedPicture": bool(stream.get("disposition", {}).get("attached_pic"))
+			})
+
+		return {
+			"duration": self.parse_number(media_format.get("duration")) or 0,
+			"formatName": media_format.get("format_name"),
+			"bitRate": self.parse_number(media_format.get("bit_rate")),
+			"streams": streams
+		}
+
+	def parse_number(self, value):
+		try:
+			return float(value)
+		except (TypeError, ValueError):
+			return None
+
+	def parse_frame_rate(self, value):
+		""" Convert an FFprobe frame rate such as "30000/1001" to frames per second. """
+		try:
+			numerator, denominator = value.split("/")
+			return float(numerator) / float(denominator) if float(denominator) else None
+		except (AttributeError, ValueError):
+			return self.parse_number(value)
@@ -11,10 +11,18 @@ class SettingsManager:
 		CONFIG_FOLDER = os.path.join(PROJECT_ROOT, 'config')
 		SETTINGS_FILE = os.path.join(CONFIG_FOLDER, 'settings.json')
 		MEDIA_FOLDER = os.path.join(PROJECT_ROOT, 'media')
+		CACHE_FOLDER = os.path.join(CONFIG_FOLDER, 'cache')
 	elif SYSTEM == "Darwin":
 		PROJECT_NAME = "Media download and conversion"
 		CONFIG_FOLDER = os.path.join(str(Path.home()), "Library", "Application Support", PROJECT_NAME)
 		MEDIA_FOLDER = os.path.join(str(Path.home()), "Downloads", PROJECT_NAME)
+		CACHE_FOLDER = os.path.join(CONFIG_FOLDER, 'cache')
+	elif SYSTEM == "Linux":
+		# Follows the XDG base directory specification, falling back to its defaults when the variables are unset.
+		PROJECT_NAME = "ezdc"
+		CONFIG_FOLDER = os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.join(str(Path.home()), ".config"), PROJECT_NAME)
+		CACHE_FOLDER = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(str(Path.home()), ".cache"), PROJECT_NAME)
+		MEDIA_FOLDER = os.path.join(os.environ.get("XDG_DOWNLOAD_DIR") or os.path.join(str(Path.home()), "Downloads"), PROJECT_NAME)
 	else:
 		raise NotImplementedError(f"Platform '{SYSTEM}' is not supported.")
 
@@ -36,10 +44,27 @@ class SettingsManager:
 		"defaultDownloadFolder": default_download_folder,
 		"downloadPreset": "",
 		"selectedDownloadPreset": 1,
+		"maxConcurrentDownloads": 3,
+		"playlistConcurrency": 3,
+		"maxHostConcurrency": 8,
+		"streamingConversion": True,
+		"directTranscode": True,
+		"bandwidthLimit": 0,
+		"offPeakBandwidthLimit": 0,
+		"offPeakStart": "22:00",
+		"offPeakEnd": "07:00",
+		"extractorCacheTTL": 1800,
+		"downloadArchive": True,
+		"logMaxEntries": 1000,
+		"conversionManifest": True,
 		"defaultConversionFolder": default_conversion_folder,
 		"conversionPreset": "",
 		"selectedConversionPreset": 0,
-		"deleteOriginalFile": False
+		"deleteOriginalFile": False,
+		"conversionWorkers": 0,
+		"segmentEncoding": True,
+		"segmentMinDuration": 1200,
+		"jobJournal": True
 	}
 
 	SETTINGS_FILE = os.path.join(CONFIG_FOLDER, "settings.json")
@@ -14,10 +14,14 @@ class ThemeManager:
 		with open(self.THEMES_CONFIG, 'r', encoding='utf-8') as f:
 			return json.load(f)
 
+	def get_theme_file(self, theme_name):
+		""" Return the path of the theme file for the given theme name. """
+		theme_file = self.supported_themes.get(theme_name, "light.qss")
+		return os.path.join(self.THEMES_FOLDER, theme_file)
+
 	def load_theme(self, theme_name):
 		""" Load the theme file for the given theme name. """
-		theme_file = self.supported_themes.get(theme_name, "light.qss")
-		theme_path = os.path.join(self.THEMES_FOLDER, theme_file)
+		theme_path = self.get_theme_file(theme_name)
 
 		with open(theme_path, "r") as f:
 			return f.read()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+
+from managers.SettingsManager import SettingsManager
+
+class ThroughputManager:
+	"""
+		Remembers the download throughput measured for every host at each fragment concurrency, in the cache folder.
+		The history is used to pick the number of fragments a new download of the same host fetches at once:
+		the fastest concurrency measured so far, or the next higher one while raising the concurrency still pays off.
+	"""
+	CACHE_FOLDER = SettingsManager.CACHE_FOLDER
+	THROUGHPUT_FILE = os.path.join(CACHE_FOLDER, 'throughput.json')
+	DEFAULT_CONCURRENCY = 4
+	MAX_CONCURRENCY = 16
+	# Weight of a new measurement in the running average, so one slow download does not erase the history.
+	SMOOTHING = 0.3
+	# A higher concurrency is only explored while the fastest one is at least this much faster than the one below it.
+	MIN_GAIN = 1.1
+
+	# Shared by every instance so concurrent download threads never overwrite each other's measurements.
+	hosts = None
+	lock = threading.Lock()
+
+	def __init__(self):
+		with self.lock:
+			if ThroughputManager.hosts is None:
+				ThroughputManager.hosts = self.load_history()
+
+	def load_history(self):
+		""" Load the throughput history from disk, or return an empty history. """
+		try:
+			with open(self.THROUGHPUT_FILE, 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return {}
+
+	def save_history(self):
+		""" Save the throughput history to disk. Must be called with the lock held. """
+		os.makedirs(self.CACHE_FOLDER, exist_ok=True)
+		temp_file = f"{self.THROUGHPUT_FILE}.{os.getpid()}.tmp"
+		with open(temp_file, 'w', encoding='utf-8') as f:
+			json.dump(self.hosts, f)
+		os.replace(temp_file, self.THROUGHPUT_FILE)
+
+	def get_concurrency(self, host, initial_concurrency=DEFAULT_CONCURRENCY):
+		"""
+			Return the fragment concurrency to use for a download from the host.
+			Starts at the initial concurrency, then doubles it while every doubling measured faster, up to MAX_CONCURRENCY,
+			and otherwise keeps the fastest concurrency measured.
+		"""
+		with self.lock:
+			samples = {int(concurrency): speed for concurrency, speed in self.hosts.get(host, {}).items()}
+
+		if not samples:
+			return min(initial_concurrency, self.MAX_CONCURRENCY)
+
+		best = max(samples, key=samples.get)
+		lower_speed = samples.get(best // 2)
+		gained = lower_speed is None or samples[best] >= lower_speed * self.MIN_GAIN
+		if gained and best * 2 <= self.MAX_CONCURRENCY and best * 2 not in samples:
+			return best * 2
+		return best
+
+	def record_throughput(self, host, concurrency, speed):
+		""" Record a throughput in bytes per second measured for the host at the given fragment concurrency. """
+		if not host or speed <= 0:
+			return
+
+		with self.lock:
+			samples = self.hosts.setdefault(host, {})
+			previous = samples.get(str(concurrency))
+			samples[str(concurrency)] = speed if previous is None else previous + (speed - previous) * self.SMOOTHING
+			self.save_history()
@@ -0,0 +1,200 @@
+from PySide6.QtCore import QObject, Signal
+
+from engines.HostLimiter import HostLimiter
+from managers.JournalManager import JournalManager
+from threads.Download import DownloadThread
+
+class DownloadQueue(QObject):
+	item_added_signal = Signal(int, str)
+	item_signal = Signal(int, str, int)
+	progress_signal = Signal(str, int, str)
+	conversion_signal = Signal(int, list)
+	file_ready_signal = Signal(int, object)
+	item_finished_signal = Signal(int)
+	completion_signal = Signal(str)
+	queue_finished_signal = Signal()
+
+	def __init__(self, download_preset, language, settings):
+		super().__init__()
+		self.download_preset = download_preset
+		self.language = language
+		self.settings = settings
+
+		self.items = []
+		self.pending = []
+		self.active_threads = {}
+		self.journal_manager = JournalManager() if settings.get("jobJournal", True) else None
+		self.host_limiter = HostLimiter(settings)
+
+	def add_urls(self, urls, destination, playlist, conversion, selected_preset, job_ids=None, audio_only=False, split_streams=False,
+			conversion_preset=None, conversion_destination=None):
+		"""
+			Adds one queue item per URL, all sharing the same destination and options.
+			`audio_only` fetches only the audio stream, for downloads converted with an audio preset.
+			`split_streams` downloads the video and audio streams apart, for the conversion to merge them while it converts.
+			`conversion_preset` is the conversion preset the item was queued with, kept so its files are converted with it
+			even if another preset is selected while the queue runs, and `conversion_destination` the folder it converts to.
+			Each item keeps its own status and progress, then free slots are filled immediately.
+			Items are recorded in the job journal; `job_ids` is given when resuming journaled jobs.
+		"""
+		for position, url in enumerate(urls):
+			if job_ids is not None:
+				job_id = job_ids[position]
+			elif self.journal_manager:
+				job_id = self.journal_manager.add_job("download", url, {
+					"destination": destination,
+					"playlist": playlist,
+					"conversion": conversion,
+					"selectedPreset": selected_preset,
+					"audioOnly": audio_only,
+					"splitStreams": split_streams,
+					"conversionPreset": conversion_preset,
+					"conversionDestination": conversion_destination
+				})
+			else:
+				job_id = None
+
+			index = len(self.items)
+			self.items.append({
+				"url": url,
+				"destination": destination,
+				"playlist": playlist,
+				"conversion": conversion,
+				"selectedPreset": selected_preset,
+				"audioOnly": audio_only,
+				"splitStreams": split_streams,
+				"conversionPreset": conversion_preset,
+				"conversionDestination": conversion_destination,
+				"jobId": job_id,
+				"status": "queued",
+				"percent": 0
+			})
+			self.pending.append(index)
+			self.item_added_signal.emit(index, url)
+
+		self.start_next()
+
+	def resume_jobs(self):
+		"""
+			Re-queues the download jobs the journal records as unfinished, with their original options.
+			Playlist entries that already finished are skipped by the DownloadThread.
+			Returns the number of resumed jobs.
+		"""
+		if not self.journal_manager:
+			return 0
+
+		jobs = self.journal_manager.get_unfinished_jobs("download")
+		for job in jobs:
+			options = job["options"]
+			self.add_urls([job["source"]], options["destination"], options["playlist"], options["conversion"], options["selectedPreset"], [job["id"]],
+				options.get("audioOnly", False), options.get("splitStreams", False), options.get("conversionPreset"), options.get("conversionDestination"))
+		return len(jobs)
+
+	def get_max_concurrent(self):
+		""" Returns the number of downloads allowed to run at the same time. """
+		return max(1, int(self.settings.get("maxConcurrentDownloads", 3)))
+
+	def start_next(self):
+		"""
+			Starts queued items until every download slot is in use.
+			Items whose host already runs as many downloads as its current limit are passed over, so a slot goes to
+			another site instead of waiting on a throttled one; they start when a download of their host finishes.
+		"""
+		while self.pending and len(self.active_threads) < self.get_max_concurrent():
+			index = next((index for index in self.pending if self.has_host_capacity(index)), None)
+			if index is None:
+				break
+			self.pending.remove(index)
+			self.start_item(index)
+
+		if not self.pending and not self.active_threads:
+			self.queue_finished_signal.emit()
+
+	def has_host_capacity(self, index):
+		""" Returns True if the host of the item runs fewer queue downloads than the per-host limit allows. """
+		host = HostLimiter.get_host(self.items[index]["url"])
+		active = sum(1 for active_index in self.active_threads if HostLimiter.get_host(self.items[active_index]["url"]) == host)
+		return active < self.host_limiter.get_limit(host)
+
+	def start_item(self, index):
+		""" Creates and starts the DownloadThread for a single queue item. """
+		item = self.items[index]
+
+		download_thread = DownloadThread(
+			item["url"],
+			item["destination"],
+			item["playlist"],
+			item["conversion"],
+			item["selectedPreset"],
+			self.download_preset,
+			self.language,
+			self.settings,
+			item["jobId"],
+			item["audioOnly"],
+			item["splitStreams"]
+		)
+
+		download_thread.progress_signal.connect(lambda message, percent, status: self.on_item_progress(index, message, percent, status))
+		download_thread.conversion_signal.connect(lambda downloaded_files: self.conversion_signal.emit(index, downloaded_files))
+		download_thread.file_ready_signal.connect(lambda media_input: self.file_ready_signal.emit(index, media_input))
+		download_thread.completion_signal.connect(self.completion_signal)
+		download_thread.finished.connect(lambda: self.on_item_finished(index))
+
+		self.active_threads[index] = download_thread
+		self.set_item_status(index, "downloading", 0)
+		download_thread.start()
+
+	def on_item_progress(self, index, message, percent, status):
+		""" Forwards a progress update and records it on the queue item it belongs to. """
+		if status == "error":
+			self.set_item_status(index, "failed", percent)
+		elif self.items[index]["status"] == "downloading":
+			self.set_item_status(index, "downloading", percent)
+
+		self.progress_signal.emit(message, percent, status)
+
+	def on_item_finished(self, index):
+		""" Releases the slot of a finished item and starts the next queued one. """
+		self.active_threads.pop(index, None)
+		if self.items[index]["status"] != "failed":
+			self.set_item_status(index, "completed", 100)
+
+		self.item_finished_signal.emit(index)
+		self.start_next()
+
+	def set_item_status(self, index, status, percent):
+		item = self.items[index]
+		if item["status"] == status and item["percent"] == percent:
+			return
+
+		item["status"] = status
+		item["percent"] = percent
+		self.item_signal.emit(index, status, percent)
+
+	def stop(self):
+		"""
+			Stops every running download and drops the items that have not started yet.
+			Running downloads are cancelled and waited on, including the parallel entries of a playlist, which stop at
+			their next progress update; anything they still hold of the bandwidth and host slots is released afterwards.
+			Stopped jobs are marked as cancelled in the journal, so they are not resumed on the next start.
+		"""
+		for index in self.pending:
+			self.set_item_status(index, "failed", 0)
+			self.cancel_job(index)
+		self.pending.clear()
+
+		for index, download_thread in self.active_threads.items():
+			self.set_item_status(index, "failed", self.items[index]["percent"])
+			download_thread.cancel()
+
+		for index, download_thread in list(self.active_threads.items()):
+			download_thread.wait()
+			download_thread.release_bandwidth()
+			download_thread.release_host_slots()
+			self.cancel_job(index)
+		self.active_threads.clear()
+
+	def cancel_job(self, index):
+		job_id = self.items[index]["jobId"]
+		if self.journal_manager and job_id is not None:
+			self.journal_manager.set_job_state(job_id, "cancelled")
@@ -0,0 +1,24 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QThread
+
+from managers.MetadataCacheManager import MetadataCacheManager
+
+class ProbeThread(QThread):
+
+	def __init__(self, media_files):
+		super().__init__()
+		self.media_files = list(media_files)
+		self.metadata_manager = MetadataCacheManager()
+
+	def run(self):
+		"""
+			Probes a batch of media files in the background and stores the results in the metadata cache.
+			Files that are already cached and unchanged are skipped, so conversion can start without probe latency.
+		"""
+		max_workers = min(4, os.cpu_count() or 1)
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			list(executor.map(self.metadata_manager.load_metadata, self.media_files))
+
+		self.metadata_manager.save_cache()
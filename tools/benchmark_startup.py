@@ -0,0 +1,108 @@
+"""
+	Measures how long the application takes to start, so startup regressions are visible.
+
+	Every run starts a fresh interpreter that imports main.py, creates the main window, shows it and
+	processes the first events, then exits. The script reports the median, minimum and maximum of:
+	- total: wall time of the whole process, including interpreter startup
+	- import: importing main.py and the modules it loads eagerly
+	- window: loading the configuration and building the main window
+	- show: showing the window and processing its first events
+	It also reports whether yt-dlp was imported during startup, which should never happen.
+
+	Runs are isolated from the user's configuration: the home, config, cache and download folders point to a temporary
+	folder shared by the runs, and unfinished jobs of the journal are never resumed, so no run starts a download.
+
+	Usage: python tools/benchmark_startup.py [--runs N] [--json]
+	The Qt "offscreen" platform is used unless QT_QPA_PLATFORM is already set, so no display is needed.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.MainWindow.resume_jobs = lambda self: None
+app, window = main.create_application([sys.argv[0]])
+created = time.perf_counter()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({
+	"import": imported - start,
+	"window": created - imported,
+	"show": shown - created,
+	"ytDlpImported": "yt_dlp" in sys.modules
+}))
+"""
+
+def run_once(home_folder):
+	""" Starts the application once in a fresh interpreter, with its folders in `home_folder`, and returns its timings in seconds. """
+	environment = dict(os.environ)
+	environment.setdefault("QT_QPA_PLATFORM", "offscreen")
+	environment.update({
+		"HOME": home_folder,
+		"XDG_CONFIG_HOME": os.path.join(home_folder, ".config"),
+		"XDG_CACHE_HOME": os.path.join(home_folder, ".cache"),
+		"XDG_DOWNLOAD_DIR": os.path.join(home_folder, "Downloads")
+	})
+
+	start = time.perf_counter()
+	result = subprocess.run(
+		[sys.executable, "-c", STARTUP_SCRIPT],
+		cwd=PROJECT_ROOT,
+		env=environment,
+		capture_output=True,
+		text=True,
+		check=True
+	)
+	total = time.perf_counter() - start
+
+	timings = json.loads(result.stdout.strip().splitlines()[-1])
+	timings["total"] = total
+	return timings
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Measure the application startup time.")
+	parser.add_argument("--runs", type=int, default=10, help="number of measured runs (default: 10)")
+	parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory(prefix="ezdc-benchmark-") as home_folder:
+		# The first run warms up the file system cache and the compiled bytecode and writes the default configuration,
+		# so it is not measured.
+		run_once(home_folder)
+		runs = [run_once(home_folder) for _ in range(args.runs)]
+
+	summary = {"runs": args.runs, "ytDlpImported": any(run["ytDlpImported"] for run in runs)}
+	for phase in ("total", "import", "window", "show"):
+		values = [run[phase] for run in runs]
+		summary[phase] = {
+			"median": statistics.median(values),
+			"min": min(values),
+			"max": max(values)
+		}
+
+	if args.json:
+		print(json.dumps(summary, indent=4))
+		return
+
+	print(f"Startup time over {args.runs} runs (median / min / max, in milliseconds):")
+	for phase in ("total", "import", "window", "show"):
+		values = summary[phase]
+		print(f"  {phase:<8} {values['median'] * 1000:8.1f} {values['min'] * 1000:8.1f} {values['max'] * 1000:8.1f}")
+	print(f"yt-dlp imported at startup: {'yes' if summary['ytDlpImported'] else 'no'}")
+
+
+if __name__ == "__main__":
+	main()
@@ -1,8 +1,12 @@
 import os
-from PySide6.QtWidgets import QWidget, QFrame, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QLineEdit, QPushButton, QCheckBox, QComboBox, QTextEdit, QProgressBar, QFileDialog, QMenu
+from PySide6.QtWidgets import QWidget, QFrame, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QLineEdit, QPushButton, QCheckBox, QComboBox, QProgressBar, QFileDialog, QMenu
 from PySide6.QtCore import Qt, Slot
 
+from engines.ConversionEngine import ConversionEngine
+from managers.JournalManager import JournalManager
 from threads.Conversion import ConversionThread
+from threads.Probe import ProbeThread
+from ui.LogView import LogView
 
 class ConversionTab(QWidget):
 	update_progress = Slot(str, int, str)
@@ -13,6 +17,8 @@ class ConversionTab(QWidget):
 		self.language = language
 		self.settings = settings
 		self.conversion_thread = None
+		self.probe_threads = []
+		self.resumed_threads = []
 
 		# Main Layout
 		main_layout = QHBoxLayout()
@@ -96,8 +102,17 @@ class ConversionTab(QWidget):
 		self.preset_combo.setAccessibleDescription(self.language["conversionTab"].get("conversionComboDescription"))
 		self.preset_combo.setToolTip(self.language["conversionTab"].get("conversionComboDescription"))
 
+		self.extra_presets_label = QLabel(self.language["conversionTab"].get("additionalPresets"))
+		self.extra_presets_list = QListWidget()
+		self.extra_presets_list.setAccessibleName(self.language["conversionTab"].get("additionalPresets"))
+		self.extra_presets_list.setAccessibleDescription(self.language["conversionTab"].get("additionalPresetsDescription"))
+		self.extra_presets_list.setToolTip(self.language["conversionTab"].get("additionalPresetsDescription"))
+		self.fill_extra_presets([])
+
 		preset_options.addWidget(self.preset_label)
 		preset_options.addWidget(self.preset_combo)
+		preset_options.addWidget(self.extra_presets_label)
+		preset_options.addWidget(self.extra_presets_list)
 
 		options_layout.addLayout(preset_options)
 		#options_layout.addLayout(more_layout)
@@ -118,8 +133,7 @@ class ConversionTab(QWidget):
 		# Log Section
 		log_layout = QVBoxLayout()
 		self.log_label = QLabel(self.language["conversionTab"].get("logLabel"))
-		self.log_output = QTextEdit()
-		self.log_output.setReadOnly(True)
+		self.log_output = LogView(int(self.settings.get("logMaxEntries", LogView.DEFAULT_MAX_ENTRIES)))
 		self.log_output.setAccessibleName(self.language["conversionTab"].get("logLabel"))
 		self.log_output.setAccessibleDescription(self.language["conversionTab"].get("logDescription"))
 		self.log_output.setToolTip(self.language["conversionTab"].get("logDescription"))
@@ -162,6 +176,7 @@ class ConversionTab(QWidget):
 			Open a file dialog to allow the user to select one or more files. 
 			Normalize the file paths for cross-platform compatibility. 
 			Add the normalized paths to the file list widget.
+			Start probing the new files in the background so their metadata is cached before conversion.
 		"""
 		file_filter = "Media Files (*.mp3 *.mp4 *.avi *.wav *.mkv *.flv *.mov *.webm);;All Files (*)"
 
@@ -171,6 +186,15 @@ class ConversionTab(QWidget):
 				normalize_path = os.path.normpath(file)
 				self.file_list.addItem(normalize_path)
 
+			self.probe_files([os.path.normpath(file) for file in files])
+
+	def probe_files(self, files):
+		""" Probe the given files in a background thread and fill the metadata cache. """
+		probe_thread = ProbeThread(files)
+		probe_thread.finished.connect(lambda: self.probe_threads.remove(probe_thread))
+		self.probe_threads.append(probe_thread)
+		probe_thread.start()
+
 	def show_remove_menu(self):
 		"""
 			Shows a context menu with options to remove selected item or all items.
@@ -213,10 +237,36 @@ class ConversionTab(QWidget):
 			normalize_path = os.path.normpath(folder)
 			self.dest_input.setText(normalize_path)
 
+	def fill_extra_presets(self, checked_presets):
+		""" Lists every conversion preset as a checkable item, checking the given ones. """
+		self.extra_presets_list.clear()
+		for preset_name in self.conversion_preset.keys():
+			item = QListWidgetItem(preset_name)
+			item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+			item.setCheckState(Qt.Checked if preset_name in checked_presets else Qt.Unchecked)
+			self.extra_presets_list.addItem(item)
+
+	def get_extra_presets(self):
+		""" Returns the names of the checked additional presets. """
+		return [
+			self.extra_presets_list.item(index).text()
+			for index in range(self.extra_presets_list.count())
+			if self.extra_presets_list.item(index).checkState() == Qt.Checked
+		]
+
+	def get_selected_presets(self):
+		"""
+			Returns the presets of the batch: the preset of the combo box, followed by the checked additional presets.
+			A single preset is returned as its name, several presets as a list of names converted from one decode.
+		"""
+		selected_presets = [self.preset_combo.currentText()]
+		selected_presets += [preset_name for preset_name in self.get_extra_presets() if preset_name not in selected_presets]
+		return selected_presets if len(selected_presets) > 1 else selected_presets[0]
+
 	def convert_file(self):
 		self.media_files = []
 		destination = self.dest_input.text().strip()
-		selected_preset = self.preset_combo.currentText()
+		selected_preset = self.get_selected_presets()
 		delete_file = self.settings["deleteOriginalFile"]
 
 		for index in range(self.file_list.count()):
@@ -241,6 +291,7 @@ class ConversionTab(QWidget):
 		self.remove_button.setEnabled(False)
 
 		self.preset_combo.setEnabled(False)
+		self.extra_presets_list.setEnabled(False)
 
 		self.convert_button.setEnabled(False)
 		self.convert_button.setText(self.language["conversionTab"].get("inProgressConvertButton"))
@@ -251,6 +302,70 @@ class ConversionTab(QWidget):
 		self.log_output.append("Preparing conversion process")
 		self.conversion_thread.start()
 
+	def is_busy(self):
+		""" Returns True while a conversion or probe is running, or files are waiting in the list. """
+		return (
+			self.conversion_thread is not None
+			or bool(self.resumed_threads)
+			or self.file_list.count() > 0
+			or any(probe_thread.isRunning() for probe_thread in self.probe_threads)
+		)
+
+	def apply_settings(self):
+		""" Applies changed settings: the default folder is updated while the tab is idle. """
+		if not self.is_busy():
+			self.dest_input.setText(self.settings["defaultConversionFolder"])
+
+	def refresh_presets(self):
+		""" Lists the reloaded presets, keeping the selected preset when it still exists. """
+		current_preset = self.preset_combo.currentText()
+		self.preset_combo.clear()
+		self.preset_combo.addItems(self.conversion_preset.keys())
+		self.preset_combo.setCurrentText(current_preset)
+		self.fill_extra_presets(self.get_extra_presets())
+
+	def resume_conversions(self):
+		"""
+			Restarts the conversion batches left unfinished by the last session, as recorded in the job journal.
+			Each batch runs in its own ConversionThread with its original options and only the files that did not finish.
+			Batches with a preset that was removed or whose files are gone are closed as failed.
+		"""
+		if not self.settings.get("jobJournal", True):
+			return
+
+		journal_manager = JournalManager()
+		jobs = journal_manager.get_unfinished_jobs("conversion")
+		resumed = 0
+		for job in jobs:
+			options = job["options"]
+			media_files = [ConversionEngine.parse_input_key(key) for key in journal_manager.get_unfinished_items(job["id"])]
+			media_files = [media_input for media_input in media_files if ConversionEngine.input_exists(media_input)]
+			selected_presets = ConversionEngine.get_preset_names(options["selectedPreset"])
+			if not media_files or any(preset_name not in self.conversion_preset for preset_name in selected_presets):
+				journal_manager.set_job_state(job["id"], "failed")
+				continue
+
+			conversion_thread = ConversionThread(
+				media_files,
+				options["destination"],
+				options["selectedPreset"],
+				self.conversion_preset,
+				self.language,
+				self.settings,
+				options["deleteFile"],
+				job_id=job["id"]
+			)
+			conversion_thread.progress_signal.connect(self.update_progress)
+			conversion_thread.completion_signal.connect(self.display_completion_message)
+			conversion_thread.finished.connect(lambda thread=conversion_thread: self.resumed_threads.remove(thread))
+
+			self.resumed_threads.append(conversion_thread)
+			conversion_thread.start()
+			resumed += 1
+
+		if resumed:
+			self.log_output.append(self.language["conversionTab"].get("resumingJobs").format(count=resumed))
+
 	def display_completion_message(self, message):
 		self.log_output.append(message)
 
@@ -265,6 +380,7 @@ class ConversionTab(QWidget):
 		self.remove_button.setEnabled(True)
 
 		self.preset_combo.setEnabled(True)
+		self.extra_presets_list.setEnabled(True)
 
 		self.convert_button.setEnabled(True)
 		self.convert_button.setText(self.language["conversionTab"].get("convertButton"))
@@ -276,20 +392,26 @@ class ConversionTab(QWidget):
 
 	def stop_conversion(self):
 		"""
-			Stops the ongoing conversion by terminating the conversion thread if it's running.
-			Ensures the thread is properly terminated and resources are released.
+			Stops the ongoing conversion by cancelling the conversion thread if it's running.
+			Its FFmpeg processes are killed and the thread is waited on, so its workers release their resources.
 			Prepares the application for a clean state after stopping the conversion.
 		"""
 		if self.conversion_thread and self.conversion_thread.isRunning():
-			self.conversion_thread.terminate()
+			self.conversion_thread.cancel()
 			self.conversion_thread.wait()
+			self.conversion_thread.set_job_state("cancelled")
 			self.conversion_thread = None
 
 	@Slot(str, int, str)
 	def update_progress(self, message, percent, status):
-		if status != "processing":
-			self.log_output.clear()
-			self.progress_bar.setValue(0)
+		"""
+			Updates the conversion progress by displaying the message and setting the progress bar value.
+			In-flight 'processing' messages replace the live status line, every other status is added to the log.
+		"""
+		if status == "processing":
+			self.log_output.set_status(message)
+		else:
+			self.log_output.set_status("")
+			self.log_output.append(message)
 
-		self.log_output.append(message)
 		self.progress_bar.setValue(percent)
\ No newline at end of file
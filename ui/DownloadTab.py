@@ -1,8 +1,9 @@
 import os
-from PySide6.QtWidgets import QWidget, QFrame, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QCheckBox, QComboBox, QTextEdit, QProgressBar, QFileDialog
+from PySide6.QtWidgets import QWidget, QFrame, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPlainTextEdit, QPushButton, QCheckBox, QComboBox, QListWidget, QProgressBar, QFileDialog
 from PySide6.QtCore import Qt, Slot
 
-from threads.Download import DownloadThread
+from threads.DownloadQueue import DownloadQueue
+from ui.LogView import LogView
 from threads.Conversion import ConversionThread
 
 class DownloadTab(QWidget):
@@ -14,8 +15,18 @@ class DownloadTab(QWidget):
 		self.conversion_preset = conversion_preset
 		self.language = language
 		self.settings = settings
-		self.download_thread = None
-		self.conversion_thread = None
+		self.conversion_threads = []
+		self.streaming_conversions = {}
+
+		self.download_queue = DownloadQueue(self.download_preset, self.language, self.settings)
+		self.download_queue.item_added_signal.connect(self.add_queue_item)
+		self.download_queue.item_signal.connect(self.update_queue_item)
+		self.download_queue.progress_signal.connect(self.update_progress)
+		self.download_queue.conversion_signal.connect(self.start_conversion)
+		self.download_queue.file_ready_signal.connect(self.convert_downloaded_file)
+		self.download_queue.item_finished_signal.connect(self.finish_streaming_conversion)
+		self.download_queue.completion_signal.connect(self.display_completion_message)
+		self.download_queue.queue_finished_signal.connect(self.download_finished)
 
 		# Main Layout
 		main_layout = QVBoxLayout()
@@ -31,7 +42,9 @@ class DownloadTab(QWidget):
 		# URL Section
 		url_layout = QHBoxLayout()
 		self.url_label = QLabel("URL:")
-		self.url_input = QLineEdit()
+		self.url_input = QPlainTextEdit()
+		self.url_input.setTabChangesFocus(True)
+		self.url_input.setMaximumHeight(80)
 		self.url_input.setAccessibleName("URL:")
 		self.url_input.setAccessibleDescription(self.language["downloadTab"].get("urlDescription"))
 		self.url_input.setToolTip(self.language["downloadTab"].get("urlDescription"))
@@ -42,9 +55,19 @@ class DownloadTab(QWidget):
 		self.clear_button.setToolTip(self.language["downloadTab"].get("clearButtonDescription"))
 		self.clear_button.clicked.connect(self.clear_url)
 
+		self.import_button = QPushButton(self.language["downloadTab"].get("importButton"))
+		self.import_button.setAccessibleName(self.language["downloadTab"].get("importButton"))
+		self.import_button.setAccessibleDescription(self.language["downloadTab"].get("importButtonDescription"))
+		self.import_button.setToolTip(self.language["downloadTab"].get("importButtonDescription"))
+		self.import_button.clicked.connect(self.import_urls)
+
+		url_buttons = QVBoxLayout()
+		url_buttons.addWidget(self.import_button)
+		url_buttons.addWidget(self.clear_button)
+
 		url_layout.addWidget(self.url_label)
 		url_layout.addWidget(self.url_input)
-		url_layout.addWidget(self.clear_button)
+		url_layout.addLayout(url_buttons)
 
 		top_frame_layout.addLayout(url_layout)
 
@@ -93,8 +116,10 @@ class DownloadTab(QWidget):
 		self.preset_combo.setToolTip(self.language["downloadTab"].get("downloadComboDescription"))
 		self.preset_combo.currentTextChanged.connect(self.on_preset_change)
 
-		self.selected_download = ""
-		self.selected_conversion = ""
+		self.selected_download = self.preset_combo.currentText()
+		conversion_presets = list(self.conversion_preset.keys())
+		conversion_index = int(self.settings.get("selectedConversionPreset", 0))
+		self.selected_conversion = conversion_presets[conversion_index] if 0 <= conversion_index < len(conversion_presets) else ""
 
 		preset_options.addWidget(self.preset_label)
 		preset_options.addWidget(self.preset_combo)
@@ -128,10 +153,19 @@ class DownloadTab(QWidget):
 		self.download_button.clicked.connect(self.download)
 		button_layout.addWidget(self.download_button, alignment=Qt.AlignCenter)
 
+		queue_layout = QVBoxLayout()
+		self.queue_label = QLabel(self.language["downloadTab"].get("queueLabel"))
+		self.queue_list = QListWidget()
+		self.queue_list.setAccessibleName(self.language["downloadTab"].get("queueLabel"))
+		self.queue_list.setAccessibleDescription(self.language["downloadTab"].get("queueDescription"))
+		self.queue_list.setToolTip(self.language["downloadTab"].get("queueDescription"))
+
+		queue_layout.addWidget(self.queue_label)
+		queue_layout.addWidget(self.queue_list)
+
 		log_layout = QVBoxLayout()
 		self.log_label = QLabel(self.language["downloadTab"].get("logLabel"))
-		self.log_output = QTextEdit()
-		self.log_output.setReadOnly(True)
+		self.log_output = LogView(int(self.settings.get("logMaxEntries", LogView.DEFAULT_MAX_ENTRIES)))
 		self.log_output.setAccessibleName(self.language["downloadTab"].get("logLabel"))
 		self.log_output.setAccessibleDescription(self.language["downloadTab"].get("logDescription"))
 		self.log_output.setToolTip(self.language["downloadTab"].get("logDescription"))
@@ -144,6 +178,7 @@ class DownloadTab(QWidget):
 
 		download_layout.addLayout(button_layout)
 		download_layout.addStretch()
+		download_layout.addLayout(queue_layout)
 		download_layout.addLayout(log_layout)
 
 		bottom_frame_layout.addLayout(download_layout)
@@ -175,6 +210,25 @@ class DownloadTab(QWidget):
 		"""
 		self.url_input.clear()
 
+	def import_urls(self):
+		"""
+			Opens a dialog to select a text file containing URLs and appends them to the URL input field.
+			Blank lines and lines starting with '#' are ignored.
+		"""
+		file_path, _ = QFileDialog.getOpenFileName(self, "Select URL List", "", "Text Files (*.txt);;All Files (*)")
+		if not file_path:
+			return
+
+		with open(file_path, 'r', encoding='utf-8') as f:
+			urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+		for url in urls:
+			self.url_input.appendPlainText(url)
+
+	def get_urls(self):
+		""" Returns the URLs entered in the URL input field, one per line or separated by spaces. """
+		return self.url_input.toPlainText().split()
+
 	def browse_folder(self):
 		"""
 			Opens a dialog to select a destination folder and updates the destination input field.
@@ -217,60 +271,133 @@ class DownloadTab(QWidget):
 
 	def download(self):
 		"""
-			Starts the download process by creating a DownloadThread with user inputs.
-			Connects thread signals for progress updates and completion handling.
-			Disables the download button and updates its text while the download runs.
+			Adds every entered URL to the download queue with the current user inputs.
+			The queue runs a bounded number of DownloadThreads and starts the next item as soon as a slot frees up.
+			The URL field is cleared so more links can be queued while downloads are running.
 		"""
-		url = self.url_input.text()
+		urls = self.get_urls()
+		if not urls:
+			return
+
 		destination = self.dest_input.text()
 		playlist = self.playlist_check.isChecked()
 		conversion = self.conversion_check.isChecked()
 		selected_preset = self.selected_download
+		conversion_preset = self.selected_conversion if conversion else None
+		audio_only = conversion and self.is_audio_conversion(conversion_preset)
+		split_streams = conversion and not audio_only and self.settings.get("directTranscode", True)
 
-		self.download_thread = DownloadThread(
-			url, 
-			destination, 
-			playlist,
-			conversion,
-			selected_preset,
-			self.download_preset, 
-			self.language, 
-			self.settings
-			)
-
-		self.download_thread.progress_signal.connect(self.update_progress)
-		self.download_thread.conversion_signal.connect(self.start_conversion)
-		self.download_thread.completion_signal.connect(self.display_completion_message)
-		self.download_thread.finished.connect(self.download_finished)
-
-		self.preset_combo.setEnabled(False)
-		self.download_button.setEnabled(False)
 		self.download_button.setText(self.language["downloadTab"].get("inProgressDownloadButton"))
 		self.download_button.setAccessibleName(self.language["downloadTab"].get("inProgressDownloadButton"))
 		self.download_button.setAccessibleDescription(self.language["downloadTab"].get("inProgressDownloadDescription"))
 		self.download_button.setToolTip(self.language["downloadTab"].get("inProgressDownloadDescription"))
 
 		self.log_output.append(self.language["downloadTab"].get("startingDownload"))
-		self.download_thread.start()
+		self.url_input.clear()
+		self.download_queue.add_urls(urls, destination, playlist, conversion, selected_preset, audio_only=audio_only, split_streams=split_streams,
+			conversion_preset=conversion_preset, conversion_destination=destination if conversion else None)
+
+	def is_audio_conversion(self, preset_name):
+		""" Returns True if the conversion preset keeps only the audio, so the video does not need to be downloaded. """
+		return self.conversion_preset.get(preset_name, {}).get("presetType") == "audio"
+
+	def is_busy(self):
+		""" Returns True while downloads or conversions are running or queued, or URLs are waiting to be queued. """
+		return bool(
+			self.download_queue.active_threads
+			or self.download_queue.pending
+			or self.conversion_threads
+			or self.url_input.toPlainText().strip()
+		)
 
-	def start_conversion(self, downloaded_files):
-		destination = self.dest_input.text()
-		option = self.conversion_check.isChecked()
-		selected_preset = self.selected_conversion
+	def apply_settings(self):
+		""" Applies changed settings: the default folder while idle, and any new download slots right away. """
+		if not self.is_busy():
+			self.dest_input.setText(self.settings["defaultDownloadFolder"])
+		self.download_queue.start_next()
+
+	def refresh_presets(self):
+		""" Lists the reloaded presets of the current mode, keeping the selected preset when it still exists. """
+		current_preset = self.preset_combo.currentText()
+		presets = self.conversion_preset if self.conversion_check.isChecked() else self.download_preset
+
+		self.preset_combo.blockSignals(True)
+		self.preset_combo.clear()
+		self.preset_combo.addItems(presets.keys())
+		self.preset_combo.setCurrentText(current_preset)
+		self.preset_combo.blockSignals(False)
+		self.on_preset_change()
+
+	def resume_downloads(self):
+		""" Re-queues the downloads left unfinished by the last session, as recorded in the job journal. """
+		count = self.download_queue.resume_jobs()
+		if count:
+			self.download_button.setText(self.language["downloadTab"].get("inProgressDownloadButton"))
+			self.download_button.setAccessibleName(self.language["downloadTab"].get("inProgressDownloadButton"))
+			self.download_button.setAccessibleDescription(self.language["downloadTab"].get("inProgressDownloadDescription"))
+			self.download_button.setToolTip(self.language["downloadTab"].get("inProgressDownloadDescription"))
+			self.log_output.append(self.language["downloadTab"].get("resumingJobs").format(count=count))
+
+	def add_queue_item(self, index, url):
+		""" Adds a new entry to the queue list for the given URL. """
+		self.queue_list.addItem(url)
+		self.update_queue_item(index, "queued", 0)
+
+	def update_queue_item(self, index, status, percent):
+		""" Updates the text of a queue entry with its current status and progress. """
+		url = self.download_queue.items[index]["url"]
+		status_text = self.language["downloadTab"].get(f"{status}Status")
+		self.queue_list.item(index).setText(f"{status_text} ({percent}%): {url}")
+
+	def start_conversion(self, index, downloaded_files, streaming=False):
+		"""
+			Starts a ConversionThread for the downloaded files of a queue item with the conversion preset it was queued with,
+			into the folder it was queued with, so changing the preset or folder while the queue runs, or before a resumed
+			job finishes, only applies to the items queued afterwards.
+			In streaming mode the thread keeps running and accepts files as each download finishes.
+			Returns the started thread.
+		"""
+		item = self.download_queue.items[index]
+		destination = item["conversionDestination"] or item["destination"]
+		option = item["conversion"]
+		selected_preset = item["conversionPreset"] or self.selected_conversion
 
-		self.conversion_thread = ConversionThread(
+		conversion_thread = ConversionThread(
 			downloaded_files,
 			destination,
 			selected_preset,
 			self.conversion_preset,
 			self.language,
 			self.settings,
-			option
+			option,
+			streaming
 		)
 
-		self.conversion_thread.progress_signal.connect(self.update_progress)
-		self.conversion_thread.completion_signal.connect(self.display_completion_message)
-		self.conversion_thread.start()
+		conversion_thread.progress_signal.connect(self.update_progress)
+		conversion_thread.completion_signal.connect(self.display_completion_message)
+		conversion_thread.finished.connect(lambda: self.conversion_threads.remove(conversion_thread))
+
+		self.conversion_threads.append(conversion_thread)
+		conversion_thread.start()
+		return conversion_thread
+
+	def convert_downloaded_file(self, index, media_input):
+		"""
+			Hands a freshly downloaded file, or the stream files of a video, to the streaming conversion of its queue item.
+			The conversion thread is created with the first file, so encoding overlaps the rest of the download.
+		"""
+		conversion_thread = self.streaming_conversions.get(index)
+		if conversion_thread is None:
+			conversion_thread = self.start_conversion(index, [], streaming=True)
+			self.streaming_conversions[index] = conversion_thread
+
+		conversion_thread.add_file(media_input)
+
+	def finish_streaming_conversion(self, index):
+		""" Lets the streaming conversion of a finished queue item complete once its last file is converted. """
+		conversion_thread = self.streaming_conversions.pop(index, None)
+		if conversion_thread is not None:
+			conversion_thread.close_input()
 
 	def display_completion_message(self, message):
 		"""Handles the final completion message and updates the log UI."""
@@ -278,37 +405,31 @@ class DownloadTab(QWidget):
 
 	def download_finished(self):
 		"""
-			Handles post-download cleanup and resets the download button.
+			Resets the download button once the whole download queue is empty.
 		"""
-		self.preset_combo.setEnabled(True)
-		self.download_button.setEnabled(True)
 		self.download_button.setText(self.language["downloadTab"].get("downloadButton"))
 		self.download_button.setAccessibleName(self.language["downloadTab"].get("downloadButton"))
 		self.download_button.setAccessibleDescription(self.language["downloadTab"].get("downloadButtonDescription"))
 		self.download_button.setToolTip(self.language["downloadTab"].get("downloadButtonDescription"))
 
-		self.download_thread = None
-
 	def stop_download(self):
 		"""
-			Stops the ongoing download by terminating the download thread if it's running.
-			Ensures the thread is properly terminated and resources are released.
-			Prepares the application for a clean state after stopping the download.
+			Stops every ongoing download by cancelling the running download threads.
+			Waits for the threads to finish so their resources are released.
+			Prepares the application for a clean state after stopping the downloads.
 		"""
-		if self.download_thread and self.download_thread.isRunning():
-			self.download_thread.terminate()
-			self.download_thread.wait()
-			self.download_thread = None
+		self.download_queue.stop()
 
 	@Slot(str, int, str)
 	def update_progress(self, message, percent, status):
 		"""
 			Updates the download progress by displaying the message and setting the progress bar value.
-			Clears the log and resets the progress bar if the status is not 'downloading'.
+			In-flight 'downloading' and 'processing' messages replace the live status line, every other status is added to the log.
 		"""
-		if status != 'downloading' and status != "processing":
-			self.log_output.clear()
-			self.progress_bar.setValue(0)
+		if status == 'downloading' or status == "processing":
+			self.log_output.set_status(message)
+		else:
+			self.log_output.set_status("")
+			self.log_output.append(message)
 
-		self.log_output.append(message)
 		self.progress_bar.setValue(percent)
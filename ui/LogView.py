@@ -0,0 +1,98 @@
+from collections import deque
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class LogModel(QAbstractListModel):
+	"""
+		List model holding the most recent log messages in a bounded ring buffer.
+		Once the buffer is full, every new message drops the oldest one, so memory stays flat on long runs.
+	"""
+
+	def __init__(self, max_entries):
+		super().__init__()
+		self.entries = deque(maxlen=max_entries)
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.entries)
+
+	def data(self, index, role=Qt.DisplayRole):
+		if not index.isValid():
+			return None
+		if role in (Qt.DisplayRole, Qt.ToolTipRole, Qt.AccessibleTextRole):
+			return self.entries[index.row()]
+		return None
+
+	def append(self, message):
+		""" Appends a message, dropping the oldest one when the buffer is full. """
+		if len(self.entries) == self.entries.maxlen:
+			self.beginRemoveRows(QModelIndex(), 0, 0)
+			self.entries.popleft()
+			self.endRemoveRows()
+
+		row = len(self.entries)
+		self.beginInsertRows(QModelIndex(), row, row)
+		self.entries.append(message)
+		self.endInsertRows()
+
+	def clear(self):
+		self.beginResetModel()
+		self.entries.clear()
+		self.endResetModel()
+
+
+class LogView(QWidget):
+	"""
+		Log widget made of a single-line live status for in-flight progress and a virtualized list of log messages.
+		Only the visible rows of the list are laid out, so its cost does not grow with the number of messages.
+	"""
+	DEFAULT_MAX_ENTRIES = 1000
+
+	def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+		super().__init__()
+		self.model = LogModel(max_entries)
+
+		self.status_label = QLabel()
+		self.status_label.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
+
+		self.list_view = QListView()
+		self.list_view.setModel(self.model)
+		self.list_view.setUniformItemSizes(True)
+		self.list_view.setTextElideMode(Qt.ElideMiddle)
+		self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+		self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+
+		layout = QVBoxLayout()
+		layout.setContentsMargins(0, 0, 0, 0)
+		layout.addWidget(self.status_label)
+		layout.addWidget(self.list_view)
+		layout.setStretch(0, 0)
+		layout.setStretch(1, 1)
+		self.setLayout(layout)
+
+	def append(self, message):
+		""" Appends a message to the log and keeps the view scrolled to the newest message if it already was. """
+		scroll_bar = self.list_view.verticalScrollBar()
+		at_bottom = scroll_bar.value() == scroll_bar.maximum()
+
+		self.model.append(message)
+		if at_bottom:
+			self.list_view.scrollToBottom()
+
+	def set_status(self, message):
+		""" Replaces the live status line with the given in-flight progress message. """
+		self.status_label.setText(message)
+		self.status_label.setAccessibleDescription(message)
+
+	def clear(self):
+		""" Clears the live status line and every log message. """
+		self.status_label.clear()
+		self.model.clear()
+
+	def setAccessibleName(self, name):
+		super().setAccessibleName(name)
+		self.list_view.setAccessibleName(name)
+
+	def setAccessibleDescription(self, description):
+		super().setAccessibleDescription(description)
+		self.list_view.setAccessibleDescription(description)
@@ -1,27 +1,19 @@
 import os
-import sys
-from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QLineEdit, QPushButton, QCheckBox, QComboBox, QTextEdit, QListWidget, QFileDialog, QMessageBox
-from PySide6.QtCore import Qt, QProcess
-
-from managers.LanguageManager import LanguageManager
-from managers.PresetManager import PresetManager
-from managers.SettingsManager import SettingsManager
-from managers.ThemeManager import ThemeManager
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QLineEdit, QPushButton, QCheckBox, QComboBox, QSpinBox, QTimeEdit, QTextEdit, QListWidget, QFileDialog, QMessageBox
+from PySide6.QtCore import Qt, QTime
 
 class SettingsTab(QWidget):
 
-	def __init__(self, download_preset, conversion_preset, language, settings):
+	def __init__(self, download_preset, conversion_preset, language, settings, config_service):
 		super().__init__()
 		self.download_ppreset = download_preset
 		self.conversion_preset = conversion_preset
 		self.language = language
 		self.settings = settings
+		self.config_service = config_service
 
-		self.language_manager = LanguageManager()
-		self.supported_languages = self.language_manager.load_supported_languages()
-
-		self.theme_manager = ThemeManager()
-		self.supported_themes = self.theme_manager.load_supported_themes()
+		self.supported_languages = self.config_service.language_manager.supported_languages
+		self.supported_themes = self.config_service.theme_manager.supported_themes
 
 		# Main Layout
 		main_layout = QVBoxLayout()
@@ -142,8 +134,131 @@ class SettingsTab(QWidget):
 
 		download_options.addLayout(download_preset_layout)
 
+		# Simultaneous Downloads
+		max_downloads_layout = QVBoxLayout()
+		self.max_downloads_label = QLabel(self.language["settingsTab"].get("maxDownloads"))
+		self.max_downloads_spin = QSpinBox()
+		self.max_downloads_spin.setRange(1, 16)
+		self.max_downloads_spin.setValue(int(self.settings.get("maxConcurrentDownloads", 3)))
+		self.max_downloads_spin.setAccessibleName(self.language["settingsTab"].get("maxDownloads"))
+		self.max_downloads_spin.setAccessibleDescription(self.language["settingsTab"].get("maxDownloadsDescription"))
+		self.max_downloads_spin.setToolTip(self.language["settingsTab"].get("maxDownloadsDescription"))
+
+		max_downloads_layout.addWidget(self.max_downloads_label)
+		max_downloads_layout.addWidget(self.max_downloads_spin)
+
+		download_options.addLayout(max_downloads_layout)
+
+		# Parallel Playlist Entries
+		playlist_concurrency_layout = QVBoxLayout()
+		self.playlist_concurrency_label = QLabel(self.language["settingsTab"].get("playlistConcurrency"))
+		self.playlist_concurrency_spin = QSpinBox()
+		self.playlist_concurrency_spin.setRange(1, 16)
+		self.playlist_concurrency_spin.setValue(int(self.settings.get("playlistConcurrency", 3)))
+		self.playlist_concurrency_spin.setAccessibleName(self.language["settingsTab"].get("playlistConcurrency"))
+		self.playlist_concurrency_spin.setAccessibleDescription(self.language["settingsTab"].get("playlistConcurrencyDescription"))
+		self.playlist_concurrency_spin.setToolTip(self.language["settingsTab"].get("playlistConcurrencyDescription"))
+
+		playlist_concurrency_layout.addWidget(self.playlist_concurrency_label)
+		playlist_concurrency_layout.addWidget(self.playlist_concurrency_spin)
+
+		download_options.addLayout(playlist_concurrency_layout)
+
+		# Downloads Per Site
+		host_concurrency_layout = QVBoxLayout()
+		self.host_concurrency_label = QLabel(self.language["settingsTab"].get("maxHostConcurrency"))
+		self.host_concurrency_spin = QSpinBox()
+		self.host_concurrency_spin.setRange(1, 32)
+		self.host_concurrency_spin.setValue(int(self.settings.get("maxHostConcurrency", 8)))
+		self.host_concurrency_spin.setAccessibleName(self.language["settingsTab"].get("maxHostConcurrency"))
+		self.host_concurrency_spin.setAccessibleDescription(self.language["settingsTab"].get("maxHostConcurrencyDescription"))
+		self.host_concurrency_spin.setToolTip(self.language["settingsTab"].get("maxHostConcurrencyDescription"))
+
+		host_concurrency_layout.addWidget(self.host_concurrency_label)
+		host_concurrency_layout.addWidget(self.host_concurrency_spin)
+
+		download_options.addLayout(host_concurrency_layout)
+
+		# Bandwidth Options
+		bandwidth_options = QHBoxLayout()
+
+		bandwidth_limit_layout = QVBoxLayout()
+		self.bandwidth_limit_label = QLabel(self.language["settingsTab"].get("bandwidthLimit"))
+		self.bandwidth_limit_spin = self.create_bandwidth_spin(
+			self.settings.get("bandwidthLimit", 0),
+			self.language["settingsTab"].get("bandwidthLimit"),
+			self.language["settingsTab"].get("bandwidthLimitDescription")
+		)
+
+		bandwidth_limit_layout.addWidget(self.bandwidth_limit_label)
+		bandwidth_limit_layout.addWidget(self.bandwidth_limit_spin)
+
+		off_peak_limit_layout = QVBoxLayout()
+		self.off_peak_limit_label = QLabel(self.language["settingsTab"].get("offPeakLimit"))
+		self.off_peak_limit_spin = self.create_bandwidth_spin(
+			self.settings.get("offPeakBandwidthLimit", 0),
+			self.language["settingsTab"].get("offPeakLimit"),
+			self.language["settingsTab"].get("offPeakLimitDescription")
+		)
+
+		off_peak_limit_layout.addWidget(self.off_peak_limit_label)
+		off_peak_limit_layout.addWidget(self.off_peak_limit_spin)
+
+		off_peak_start_layout = QVBoxLayout()
+		self.off_peak_start_label = QLabel(self.language["settingsTab"].get("offPeakStart"))
+		self.off_peak_start_edit = self.create_time_edit(
+			self.settings.get("offPeakStart", "22:00"),
+			self.language["settingsTab"].get("offPeakStart"),
+			self.language["settingsTab"].get("offPeakWindowDescription")
+		)
+
+		off_peak_start_layout.addWidget(self.off_peak_start_label)
+		off_peak_start_layout.addWidget(self.off_peak_start_edit)
+
+		off_peak_end_layout = QVBoxLayout()
+		self.off_peak_end_label = QLabel(self.language["settingsTab"].get("offPeakEnd"))
+		self.off_peak_end_edit = self.create_time_edit(
+			self.settings.get("offPeakEnd", "07:00"),
+			self.language["settingsTab"].get("offPeakEnd"),
+			self.language["settingsTab"].get("offPeakWindowDescription")
+		)
+
+		off_peak_end_layout.addWidget(self.off_peak_end_label)
+		off_peak_end_layout.addWidget(self.off_peak_end_edit)
+
+		bandwidth_options.addLayout(bandwidth_limit_layout)
+		bandwidth_options.addLayout(off_peak_limit_layout)
+		bandwidth_options.addLayout(off_peak_start_layout)
+		bandwidth_options.addLayout(off_peak_end_layout)
+
+		# More Download Settings
+		more_download_layout = QHBoxLayout()
+		self.streaming_conversion_check = QCheckBox(self.language["settingsTab"].get("streamingConversion"))
+		self.streaming_conversion_check.setAccessibleName(self.language["settingsTab"].get("streamingConversion"))
+		self.streaming_conversion_check.setAccessibleDescription(self.language["settingsTab"].get("streamingConversionDescription"))
+		self.streaming_conversion_check.setToolTip(self.language["settingsTab"].get("streamingConversionDescription"))
+		self.streaming_conversion_check.setChecked(self.settings.get("streamingConversion", True))
+
+		self.direct_transcode_check = QCheckBox(self.language["settingsTab"].get("directTranscode"))
+		self.direct_transcode_check.setAccessibleName(self.language["settingsTab"].get("directTranscode"))
+		self.direct_transcode_check.setAccessibleDescription(self.language["settingsTab"].get("directTranscodeDescription"))
+		self.direct_transcode_check.setToolTip(self.language["settingsTab"].get("directTranscodeDescription"))
+		self.direct_transcode_check.setChecked(self.settings.get("directTranscode", True))
+
+		self.download_archive_check = QCheckBox(self.language["settingsTab"].get("downloadArchive"))
+		self.download_archive_check.setAccessibleName(self.language["settingsTab"].get("downloadArchive"))
+		self.download_archive_check.setAccessibleDescription(self.language["settingsTab"].get("downloadArchiveDescription"))
+		self.download_archive_check.setToolTip(self.language["settingsTab"].get("downloadArchiveDescription"))
+		self.download_archive_check.setChecked(self.settings.get("downloadArchive", True))
+
+		more_download_layout.addWidget(self.streaming_conversion_check)
+		more_download_layout.addWidget(self.direct_transcode_check)
+		more_download_layout.addWidget(self.download_archive_check)
+
 		download_settings_layout.addLayout(download_folder_layout)
 		download_settings_layout.addLayout(download_options)
+		download_settings_layout.addLayout(bandwidth_options)
+		download_settings_layout.addLayout(more_download_layout)
 
 		download_settings_box.setLayout(download_settings_layout)
 
@@ -188,6 +303,22 @@ class SettingsTab(QWidget):
 
 		conversion_options.addLayout(conversion_preset_layout)
 
+		# Parallel Conversion Workers
+		conversion_workers_layout = QVBoxLayout()
+		self.conversion_workers_label = QLabel(self.language["settingsTab"].get("conversionWorkers"))
+		self.conversion_workers_spin = QSpinBox()
+		self.conversion_workers_spin.setRange(0, os.cpu_count() or 1)
+		self.conversion_workers_spin.setSpecialValueText(self.language["settingsTab"].get("automatic"))
+		self.conversion_workers_spin.setValue(int(self.settings.get("conversionWorkers", 0)))
+		self.conversion_workers_spin.setAccessibleName(self.language["settingsTab"].get("conversionWorkers"))
+		self.conversion_workers_spin.setAccessibleDescription(self.language["settingsTab"].get("conversionWorkersDescription"))
+		self.conversion_workers_spin.setToolTip(self.language["settingsTab"].get("conversionWorkersDescription"))
+
+		conversion_workers_layout.addWidget(self.conversion_workers_label)
+		conversion_workers_layout.addWidget(self.conversion_workers_spin)
+
+		conversion_options.addLayout(conversion_workers_layout)
+
 		# More Conversion Settings
 		more_conversion_layout = QHBoxLayout()
 		self.delete_original_check = QCheckBox(self.language["settingsTab"].get("deleteOriginal"))
@@ -196,7 +327,14 @@ class SettingsTab(QWidget):
 		self.delete_original_check.setToolTip(self.language["settingsTab"].get("deleteOriginalDescription"))
 		self.delete_original_check.setChecked(self.settings["deleteOriginalFile"])
 
+		self.segment_encoding_check = QCheckBox(self.language["settingsTab"].get("segmentEncoding"))
+		self.segment_encoding_check.setAccessibleName(self.language["settingsTab"].get("segmentEncoding"))
+		self.segment_encoding_check.setAccessibleDescription(self.language["settingsTab"].get("segmentEncodingDescription"))
+		self.segment_encoding_check.setToolTip(self.language["settingsTab"].get("segmentEncodingDescription"))
+		self.segment_encoding_check.setChecked(self.settings.get("segmentEncoding", True))
+
 		more_conversion_layout.addWidget(self.delete_original_check)
+		more_conversion_layout.addWidget(self.segment_encoding_check)
 
 		conversion_settings_layout.addLayout(conversion_folder_layout)
 		conversion_settings_layout.addLayout(conversion_options)
@@ -237,6 +375,29 @@ class SettingsTab(QWidget):
 
 
 	# Class Method
+	def create_bandwidth_spin(self, value, name, description):
+		""" Creates a spin box for a bandwidth limit in KB/s, where 0 means unlimited. """
+		spin = QSpinBox()
+		spin.setRange(0, 1000000)
+		spin.setSingleStep(100)
+		spin.setSuffix(" KB/s")
+		spin.setSpecialValueText(self.language["settingsTab"].get("unlimited"))
+		spin.setValue(int(value or 0))
+		spin.setAccessibleName(name)
+		spin.setAccessibleDescription(description)
+		spin.setToolTip(description)
+		return spin
+
+	def create_time_edit(self, value, name, description):
+		""" Creates a time field for an "HH:MM" setting of the off-peak window. """
+		time_edit = QTimeEdit()
+		time_edit.setDisplayFormat("HH:mm")
+		time_edit.setTime(QTime.fromString(value, "HH:mm"))
+		time_edit.setAccessibleName(name)
+		time_edit.setAccessibleDescription(description)
+		time_edit.setToolTip(description)
+		return time_edit
+
 	def browse_download_folder(self):
 		"""
 			Opens a dialog to select a destination folder for default downloaded folder and updates the destination input field.
@@ -259,33 +420,66 @@ class SettingsTab(QWidget):
 			normalize_path = os.path.normpath(folder)
 			self.conversion_input.setText(normalize_path)
 
+	def is_busy(self):
+		return False
+
+	def apply_settings(self):
+		self.load_values()
+
+	def refresh_presets(self):
+		""" Lists the reloaded presets, keeping the selected defaults when they still exist. """
+		download_preset = self.download_preset_combo.currentText()
+		self.download_preset_combo.clear()
+		self.download_preset_combo.addItems(self.download_ppreset.keys())
+		self.download_preset_combo.setCurrentText(download_preset)
+
+		conversion_preset = self.conversion_preset_combo.currentText()
+		self.conversion_preset_combo.clear()
+		self.conversion_preset_combo.addItems(self.conversion_preset.keys())
+		self.conversion_preset_combo.setCurrentText(conversion_preset)
+
+	def load_values(self):
+		""" Shows the current settings in every field, for example after a reset or a change of the settings file. """
+		self.language_combo.setCurrentText(self.settings["language"])
+		self.theme_combo.setCurrentIndex(self.settings["selectedTheme"])
+		self.font_size_combo.setCurrentIndex(self.settings["selectedFontSize"])
+		self.download_input.setText(self.settings["defaultDownloadFolder"])
+		self.download_preset_combo.setCurrentIndex(self.settings["selectedDownloadPreset"])
+		self.max_downloads_spin.setValue(int(self.settings.get("maxConcurrentDownloads", 3)))
+		self.playlist_concurrency_spin.setValue(int(self.settings.get("playlistConcurrency", 3)))
+		self.host_concurrency_spin.setValue(int(self.settings.get("maxHostConcurrency", 8)))
+		self.streaming_conversion_check.setChecked(self.settings.get("streamingConversion", True))
+		self.direct_transcode_check.setChecked(self.settings.get("directTranscode", True))
+		self.download_archive_check.setChecked(self.settings.get("downloadArchive", True))
+		self.bandwidth_limit_spin.setValue(int(self.settings.get("bandwidthLimit", 0) or 0))
+		self.off_peak_limit_spin.setValue(int(self.settings.get("offPeakBandwidthLimit", 0) or 0))
+		self.off_peak_start_edit.setTime(QTime.fromString(self.settings.get("offPeakStart", "22:00"), "HH:mm"))
+		self.off_peak_end_edit.setTime(QTime.fromString(self.settings.get("offPeakEnd", "07:00"), "HH:mm"))
+		self.conversion_input.setText(self.settings["defaultConversionFolder"])
+		self.conversion_preset_combo.setCurrentIndex(self.settings["selectedConversionPreset"])
+		self.delete_original_check.setChecked(self.settings["deleteOriginalFile"])
+		self.segment_encoding_check.setChecked(self.settings.get("segmentEncoding", True))
+		self.conversion_workers_spin.setValue(int(self.settings.get("conversionWorkers", 0)))
+
 	def reset_settings(self):
-		""" Reset all settings to default values. """
-		settings_manager = SettingsManager()
-		default_settings = settings_manager.DEFAULT_SETTINGS
-
-		self.language_combo.setCurrentText(default_settings["language"])
-		self.theme_combo.setCurrentIndex(default_settings["selectedTheme"])
-		self.font_size_combo.setCurrentIndex(default_settings["selectedFontSize"])
-		self.download_input.setText(default_settings["defaultDownloadFolder"])
-		self.download_preset_combo.setCurrentIndex(default_settings["selectedDownloadPreset"])
-		self.conversion_input.setText(default_settings["defaultConversionFolder"])
-		self.conversion_preset_combo.setCurrentIndex(default_settings["selectedConversionPreset"])
-		self.delete_original_check.setChecked(default_settings["deleteOriginalFile"])
-
-		settings_manager.reset_settings()
+		"""
+			Reset all settings to default values.
+			The defaults are applied right away, so running downloads and conversions keep going.
+		"""
+		self.config_service.reset_settings()
+		self.load_values()
+
 		alert_title = self.language["settingsTab"].get("resetAlertTitle")
 		alert_message = self.language["settingsTab"].get("resetAlertMessage")
 		QMessageBox.information(self, alert_title, alert_message)
 
-		QApplication.instance().quit()
-		QProcess.startDetached(sys.executable, sys.argv)
-
 	def save_settings(self):
-		"""Save the current settings and notify the user."""
-		settings_manager = SettingsManager()
-
-		new_settings = {
+		"""
+			Save the current settings and notify the user.
+			Settings without a field in this tab are kept, and the new settings are applied right away without a restart.
+		"""
+		new_settings = dict(self.settings)
+		new_settings.update({
 			"language": self.language_combo.currentText(),
 			"themeName": self.theme_combo.currentText(),
 			"selectedTheme": self.theme_combo.currentIndex(),
@@ -294,16 +488,25 @@ class SettingsTab(QWidget):
 			"defaultDownloadFolder": self.download_input.text(),
 			"downloadPreset": self.download_preset_combo.currentText(),
 			"selectedDownloadPreset": self.download_preset_combo.currentIndex(),
+			"maxConcurrentDownloads": self.max_downloads_spin.value(),
+			"playlistConcurrency": self.playlist_concurrency_spin.value(),
+			"maxHostConcurrency": self.host_concurrency_spin.value(),
+			"streamingConversion": self.streaming_conversion_check.isChecked(),
+			"directTranscode": self.direct_transcode_check.isChecked(),
+			"downloadArchive": self.download_archive_check.isChecked(),
+			"bandwidthLimit": self.bandwidth_limit_spin.value(),
+			"offPeakBandwidthLimit": self.off_peak_limit_spin.value(),
+			"offPeakStart": self.off_peak_start_edit.time().toString("HH:mm"),
+			"offPeakEnd": self.off_peak_end_edit.time().toString("HH:mm"),
 			"defaultConversionFolder": self.conversion_input.text(),
 			"conversionPreset": self.conversion_preset_combo.currentText(),
 			"selectedConversionPreset": self.conversion_preset_combo.currentIndex(),
-			"deleteOriginalFile": self.delete_original_check.isChecked()
-		}
+			"deleteOriginalFile": self.delete_original_check.isChecked(),
+			"segmentEncoding": self.segment_encoding_check.isChecked(),
+			"conversionWorkers": self.conversion_workers_spin.value()
+		})
 
-		settings_manager.save_settings(new_settings)
+		self.config_service.save_settings(new_settings)
 		alert_title = self.language["settingsTab"].get("saveAlertTitle")
 		alert_message = self.language["settingsTab"].get("saveAlertMessage")
-		QMessageBox.information(self, alert_title, alert_message)
-
-		QApplication.instance().quit()
-		QProcess.startDetached(sys.executable, sys.argv)
\ No newline at end of file
+		QMessageBox.information(self, alert_title, alert_message)
\ No newline at end of file